@@ -0,0 +1,83 @@
+import os
+import numpy as np
+
+from array_storage import open_array, load_array, tiled_marginals
+
+
+class AmbiguityFunction:
+    """
+    Взаимная функция неопределенности.
+
+    Хранит одномерные оси задержки и доплеровской частоты, матрицу модуля
+    функции (строки - доплеровская частота, столбцы - задержка) и её сечения
+    по максимумам, которые заполняются одновременно с матрицей.
+    """
+    def __init__(self, tao_list: np.ndarray, doppler_list: np.ndarray, path: str = None):
+        # Оси функции
+        self.tao_list = tao_list
+        self.doppler_list = doppler_list
+        self.path = path
+
+        # Матрица модуля функции неопределенности.
+        # Хранится по столбцам, т.к. заполняется по отсчётам задержки.
+        shape = (doppler_list.size, tao_list.size)
+        if path is None:
+            self.values = np.empty(shape, order="F")
+        else:
+            self.values = open_array(path, shape, fortran_order=True)
+            np.savez(self._axes_path(path), tao=tao_list, doppler=doppler_list)
+
+        # Сечения по максимумам
+        self.fn2d_tao = np.zeros(tao_list.size)
+        self.fn2d_doppler = np.zeros(doppler_list.size)
+
+    @staticmethod
+    def _axes_path(path: str):
+        """
+        Путь к файлу с осями функции, хранящемуся рядом с матрицей.
+        """
+        return os.path.splitext(path)[0] + "_axes.npz"
+
+    @classmethod
+    def load(cls, path: str, tile: int):
+        """
+        Открыть сохранённую функцию и вычислить сечения по блокам, не загружая матрицу в память.
+        """
+        axes = np.load(cls._axes_path(path))
+        fn3d = cls.__new__(cls)
+        fn3d.tao_list = axes["tao"]
+        fn3d.doppler_list = axes["doppler"]
+        fn3d.path = path
+        fn3d.values = load_array(path)
+        fn3d.fn2d_doppler, fn3d.fn2d_tao = tiled_marginals(fn3d.values, tile)
+        return fn3d
+
+    def set_tile(self, start: int, block: np.ndarray):
+        """
+        Записать блок столбцов функции, начиная с отсчёта задержки start, и обновить сечения.
+        """
+        stop = start + block.shape[1]
+        self.values[:, start:stop] = block
+        self.fn2d_tao[start:stop] = block.max(axis=0)
+        np.maximum(self.fn2d_doppler, block.max(axis=1), out=self.fn2d_doppler)
+
+    def flush(self):
+        """
+        Сбросить матрицу на диск, если она отображена в файл.
+        """
+        if isinstance(self.values, np.memmap):
+            self.values.flush()
+
+    @property
+    def peak_tao(self):
+        """
+        Задержка, соответствующая главному максимуму, сек.
+        """
+        return self.tao_list[np.argmax(self.fn2d_tao)]
+
+    @property
+    def peak_doppler(self):
+        """
+        Доплеровская частота, соответствующая главному максимуму, Гц.
+        """
+        return self.doppler_list[np.argmax(self.fn2d_doppler)]
@@ -0,0 +1,51 @@
+import os
+import numpy as np
+
+
+def open_array(path: str, shape: tuple, dtype=np.float64, fortran_order: bool = False):
+    """
+    Создать массив в файле формата .npy, отображаемый в память.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape, fortran_order=fortran_order)
+
+
+def load_array(path: str, mode: str = "r"):
+    """
+    Открыть сохранённый массив без загрузки в оперативную память.
+    """
+    return np.load(path, mmap_mode=mode)
+
+
+def iter_tiles(size: int, tile: int):
+    """
+    Разбиение диапазона [0, size) на блоки длиной не более tile.
+    """
+    for start in range(0, size, tile):
+        yield start, min(start + tile, size)
+
+
+def tiled_marginals(values: np.ndarray, tile: int):
+    """
+    Максимумы матрицы по строкам и по столбцам с чтением блоками столбцов.
+    """
+    rows_max = np.full(values.shape[0], -np.inf)
+    cols_max = np.empty(values.shape[1])
+    for start, stop in iter_tiles(values.shape[1], tile):
+        block = np.asarray(values[:, start:stop])
+        cols_max[start:stop] = block.max(axis=0)
+        np.maximum(rows_max, block.max(axis=1), out=rows_max)
+    return rows_max, cols_max
+
+
+def tiled_mean(values: np.ndarray, tile: int):
+    """
+    Среднее значение по последней оси с чтением блоками строк.
+    """
+    result = np.empty(values.shape[0])
+    for start, stop in iter_tiles(values.shape[0], tile):
+        block = np.asarray(values[start:stop])
+        result[start:stop] = block.reshape(stop - start, -1).mean(axis=1)
+    return result
@@ -0,0 +1,183 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+import numpy as np
+
+from signals_generator import SignalGenerator
+from research_logic import calc_research_bad_alg
+from peak_statistics import peak_statistics
+from enums import ModulationType, NoiseType
+
+# Сетка параметров по умолчанию
+DEFAULT_SAMPLING_RATES = [1000, 2000, 4000]
+DEFAULT_BITS_COUNTS = [25, 50, 100]
+DEFAULT_BITS_PER_SECOND = [100]
+
+# Допустимое относительное замедление при сравнении с эталонными результатами
+DEFAULT_TOLERANCE = 0.2
+
+
+def measure(func, repeat: int):
+    """
+    Измерить минимальное время выполнения функции и пиковый объём выделенной памяти.
+
+    Время измеряется без трассировки памяти (tracemalloc замедляет выделение
+    памяти), пиковый объём - в отдельном запуске с трассировкой.
+    """
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def benchmark_point(sampling_rate: float, bits_count: int, bits_per_second: float,
+                    repeat: int, research_average: int):
+    """
+    Замер всех стадий SignalGenerator для одной точки сетки параметров.
+    """
+    generator = SignalGenerator(s_r=sampling_rate, b_count=bits_count, bps=bits_per_second)
+    results = []
+
+    def add(stage: str, func, samples: int = 0, trials: int = 0):
+        seconds, peak = measure(func, repeat)
+        results.append({"stage": stage,
+                        "sampling_rate": sampling_rate,
+                        "bits_count": bits_count,
+                        "bits_per_second": bits_per_second,
+                        "seconds": seconds,
+                        "samples_per_second": samples / seconds if samples else None,
+                        "trials_per_second": trials / seconds if trials else None,
+                        "peak_memory": peak})
+
+    # Генерация битов и I/Q компонент
+    add("generate_info_bits", generator._generate_info_bits, trials=1)
+    generator._generate_info_bits()
+    generator.reference_i, generator.reference_q = generator._get_components(generator.reference_bits)
+    generator.research_i, generator.research_q = generator._get_components(generator.research_bits)
+    reference_params = generator._get_signal_parameters(len(generator.reference_i))
+    research_params = generator._get_signal_parameters(len(generator.research_i))
+
+    # Модуляция
+    for mod_type in ModulationType:
+        def modulate():
+            generator.reference_mod = generator._calc_modulation(mod_type, reference_params)
+            generator.research_mod = generator._calc_modulation(mod_type, research_params)
+        modulate()
+        samples = len(generator.reference_mod[0]) + len(generator.research_mod[0])
+        add(f"calc_modulation_{mod_type.name}", modulate, samples=samples)
+
+    # Шум
+    clean_reference, clean_research = generator.reference_mod, generator.research_mod
+
+    def add_noise():
+        generator.reference_mod = generator._get_noise_parts(clean_reference)
+        generator.research_mod = generator._get_noise_parts(clean_research)
+    for noise_type in NoiseType:
+        generator.noise_type = noise_type
+        add(f"get_noise_parts_{noise_type.name}", add_noise, samples=samples)
+    generator.noise_type = NoiseType.LEGACY
+    add_noise()
+
+    # Корреляция, функция неопределенности и её сечения
+    research_samples = len(generator.research_mod[0])
+    add("get_correlation", generator._get_correlation, samples=research_samples)
+    generator.correlation = generator._get_correlation()
+    add("calc_correlation_stats", generator._calc_correlation_stats, samples=len(generator.correlation[1]))
+    # Пакетное вычисление статистик для многих испытаний
+    batch = np.tile(generator.correlation[1], (research_average, 1))
+    mainlobe = generator._get_mainlobe_samples()
+    add("peak_statistics_batch", lambda: peak_statistics(batch, mainlobe), trials=research_average)
+
+    def calc_3d():
+        generator.fn3d = generator._calc_3d_function()
+    add("calc_3d_function", calc_3d, samples=research_samples)
+    generator.fft_workers = os.cpu_count() or 1
+    add("calc_3d_function_threads", calc_3d, samples=research_samples)
+    generator.fft_workers = 1
+    add("calc_2d_function", generator._calc_2d_function, samples=generator.fn3d.values.size)
+
+    # Фрагмент исследования
+    def research():
+        with contextlib.redirect_stdout(io.StringIO()):
+            calc_research_bad_alg(research_average, generator, 0., 0.02, 0.01)
+    add("calc_research_bad_alg", research, trials=2 * research_average)
+    return results
+
+
+def compare_results(results: list, baseline: list, tolerance: float):
+    """
+    Сравнить результаты с эталонными и вернуть список замедлившихся стадий.
+    """
+    def key(item):
+        return item["stage"], item["sampling_rate"], item["bits_count"], item["bits_per_second"]
+
+    baseline_times = {key(item): item["seconds"] for item in baseline}
+    regressions = []
+    for item in results:
+        base = baseline_times.get(key(item))
+        if base is not None and item["seconds"] > base * (1. + tolerance):
+            regressions.append({**item, "baseline_seconds": base})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер производительности стадий SignalGenerator")
+    parser.add_argument("--sampling-rate", type=float, nargs="+", default=DEFAULT_SAMPLING_RATES)
+    parser.add_argument("--bits-count", type=int, nargs="+", default=DEFAULT_BITS_COUNTS)
+    parser.add_argument("--bits-per-second", type=float, nargs="+", default=DEFAULT_BITS_PER_SECOND)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--research-average", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="Файл с эталонными результатами")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = []
+    for sampling_rate, bits_count, bits_per_second in itertools.product(args.sampling_rate, args.bits_count,
+                                                                        args.bits_per_second):
+        print(f"Замер: fs={sampling_rate}, bits={bits_count}, bps={bits_per_second}")
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+        results.extend(benchmark_point(sampling_rate, bits_count, bits_per_second,
+                                       args.repeat, args.research_average))
+
+    for item in results:
+        print(f"{item['stage']:>28} fs={item['sampling_rate']:<8g} bits={item['bits_count']:<5} "
+              f"{item['seconds'] * 1000:10.2f} мс {item['peak_memory'] / 2 ** 20:8.2f} МБ")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({"platform": platform.platform(),
+                   "python": platform.python_version(),
+                   "numpy": np.__version__,
+                   "results": results}, file, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare_results(results, baseline, args.tolerance)
+        for item in regressions:
+            print(f"Замедление: {item['stage']} fs={item['sampling_rate']:g} bits={item['bits_count']}: "
+                  f"{item['baseline_seconds'] * 1000:.2f} -> {item['seconds'] * 1000:.2f} мс")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
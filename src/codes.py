@@ -0,0 +1,120 @@
+import numpy as np
+
+# Отводы регистров сдвига, порождающих M-последовательности
+M_SEQUENCE_TAPS = {
+    3: (3, 2),
+    4: (4, 3),
+    5: (5, 3),
+    6: (6, 5),
+    7: (7, 6),
+    8: (8, 6, 5, 4),
+    9: (9, 5),
+    10: (10, 7),
+    11: (11, 9),
+    12: (12, 6, 4, 1),
+}
+
+# Предпочтительные пары регистров для кодов Голда
+GOLD_PREFERRED_PAIRS = {
+    5: ((5, 3), (5, 4, 3, 2)),
+    6: ((6, 1), (6, 5, 2, 1)),
+    7: ((7, 3), (7, 3, 2, 1)),
+    9: ((9, 4), (9, 6, 4, 3)),
+    10: ((10, 3), (10, 8, 3, 2)),
+    11: ((11, 2), (11, 8, 5, 2)),
+}
+
+# Коды Баркера (1 - фаза 0, 0 - фаза pi)
+BARKER_CODES = {
+    2: (1, 0),
+    3: (1, 1, 0),
+    4: (1, 1, 0, 1),
+    5: (1, 1, 1, 0, 1),
+    7: (1, 1, 1, 0, 0, 1, 0),
+    11: (1, 1, 1, 0, 0, 0, 1, 0, 0, 1, 0),
+    13: (1, 1, 1, 1, 1, 0, 0, 1, 1, 0, 1, 0, 1),
+}
+
+
+def lfsr_sequence(taps: tuple, length: int = None):
+    """
+    Последовательность на выходе регистра сдвига с линейной обратной связью.
+
+    :param taps: Номера отводов (первый - степень регистра).
+    :param length: Длина последовательности (по умолчанию - период 2^n - 1).
+    """
+    degree = taps[0]
+    if length is None:
+        length = 2 ** degree - 1
+    register = [1] * degree
+    sequence = np.empty(length, dtype=np.uint8)
+    for i in range(length):
+        sequence[i] = register[-1]
+        feedback = 0
+        for tap in taps:
+            feedback ^= register[tap - 1]
+        register = [feedback] + register[:-1]
+    return sequence
+
+
+def _min_degree(length: int, degrees):
+    """
+    Наименьшая степень регистра, период которого не меньше length.
+    """
+    for degree in sorted(degrees):
+        if 2 ** degree - 1 >= length:
+            return degree
+    raise ValueError(f"Длина кода {length} превышает максимальную поддерживаемую")
+
+
+def m_sequence(length: int):
+    """
+    M-последовательность наименьшей подходящей степени, усечённая до length.
+    """
+    return lfsr_sequence(M_SEQUENCE_TAPS[_min_degree(length, M_SEQUENCE_TAPS)], length)
+
+
+def gold_code(length: int, shift: int = 0):
+    """
+    Код Голда наименьшей подходящей степени, усечённый до length.
+
+    :param shift: Циклический сдвиг второй последовательности (номер кода в семействе).
+    """
+    degree = _min_degree(length, GOLD_PREFERRED_PAIRS)
+    first_taps, second_taps = GOLD_PREFERRED_PAIRS[degree]
+    first = lfsr_sequence(first_taps)
+    second = np.roll(lfsr_sequence(second_taps), -shift)
+    return (first ^ second)[:length]
+
+
+def barker_order(length: int):
+    """
+    Порядок (длина) самого длинного кода Баркера, не превышающего length.
+    """
+    return max(order for order in BARKER_CODES if order <= max(length, 2))
+
+
+def barker_code(length: int):
+    """
+    Самый длинный код Баркера, не превышающий length, с растяжением
+    элементов на length отсчётов.
+    """
+    order = barker_order(length)
+    code = np.array(BARKER_CODES[order], dtype=np.uint8)
+    return code[np.arange(length) * order // length]
+
+
+def frank_order(length: int):
+    """
+    Порядок кода Фрэнка (количество фаз), длина которого не меньше length.
+    """
+    return max(int(np.ceil(np.sqrt(length))), 2)
+
+
+def frank_code(length: int):
+    """
+    Многофазный код Фрэнка: номера фаз (i * j) mod M, усечённые до length.
+    """
+    order = frank_order(length)
+    indices = np.arange(order)
+    return (np.outer(indices, indices) % order).ravel()[:length]
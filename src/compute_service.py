@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from signals_generator import SignalGenerator
+from sweep import SweepPlan, SWEEP_METRICS, MOD_TYPE_AXIS, apply_parameters, run_unit, collect_results
+
+# Адрес сервиса по умолчанию
+DEFAULT_SERVICE_HOST = "127.0.0.1"
+DEFAULT_SERVICE_PORT = 8765
+# Максимальная длина строки запроса, байт
+MAX_REQUEST_SIZE = 1 << 24
+# Параметры генератора, которые клиенты не могут задавать (запись файлов на сервере)
+FORBIDDEN_PARAMETERS = ("fn3d_path",)
+
+# Коды ошибок JSON-RPC
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def calculate_point(params: dict, include_correlation: bool = False):
+    """
+    Однократный расчёт SignalGenerator с заданными параметрами (в процессе пула).
+    """
+    generator = SignalGenerator()
+    mod_type = apply_parameters(generator, params)
+    generator.calculate(mod_type)
+    result = {"found_time_delay": float(generator.found_time_delay),
+              "criterion": float(generator.criterion),
+              "found_time_delay_f": float(generator.found_time_delay_f),
+              "found_doppler": float(generator.found_doppler),
+              "correlation_stats": {name: float(value) for name, value in generator.correlation_stats.items()}}
+    if include_correlation:
+        result["correlation"] = [np.asarray(generator.correlation[0]).tolist(),
+                                 np.asarray(generator.correlation[1]).tolist()]
+    return result
+
+
+class RpcError(Exception):
+    """
+    Ошибка обработки запроса JSON-RPC.
+    """
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _check_parameters(*groups):
+    """
+    Отклонить запрос, задающий параметры из FORBIDDEN_PARAMETERS.
+
+    :param groups: Словари параметров запроса (параметры точки, оси плана, общие параметры).
+    """
+    forbidden = sorted({name for group in groups for name in (group or {}) if name in FORBIDDEN_PARAMETERS})
+    if forbidden:
+        raise RpcError(INVALID_PARAMS, f"Параметры недоступны клиентам сервиса: {', '.join(forbidden)}")
+
+
+class ComputeService:
+    """
+    Сервис вычислений: JSON-RPC 2.0 поверх TCP или Unix-сокета, по одному
+    сообщению JSON в строке.
+
+    Методы:
+        calculate - однократный расчёт (params: parameters, include_correlation);
+        sweep - исследование по плану (params: axes или ranges + count, average_count,
+                base); ход выполнения передаётся уведомлениями "progress";
+        status - количество выполняемых запросов.
+
+    Вычисления выполняются в пуле процессов. Одинаковые запросы, поступившие
+    во время выполнения первого из них, не запускаются повторно, а ожидают
+    его результат (и получают уведомления о ходе выполнения).
+    """
+    METHODS = ("calculate", "sweep", "status")
+
+    def __init__(self, processes: int = None):
+        self.executor = ProcessPoolExecutor(processes)
+        # Выполняемые задачи: ключ запроса -> (задача, подписчики на уведомления)
+        self.jobs = {}
+
+    def close(self):
+        self.executor.shutdown()
+
+    async def _coalesce(self, key: str, factory, notify):
+        """
+        Выполнить задачу factory(broadcast) или присоединиться к уже выполняемой с тем же ключом.
+        """
+        if key not in self.jobs:
+            listeners = []
+
+            async def broadcast(message: dict):
+                for listener in list(listeners):
+                    try:
+                        await listener(message)
+                    except ConnectionError:
+                        # Клиент отключился - результат остаётся нужен остальным
+                        listeners.remove(listener)
+            task = asyncio.ensure_future(factory(broadcast))
+            self.jobs[key] = (task, listeners)
+            task.add_done_callback(lambda _: self.jobs.pop(key, None))
+        task, listeners = self.jobs[key]
+        listeners.append(notify)
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if notify in listeners:
+                listeners.remove(notify)
+
+    async def calculate(self, params: dict, notify):
+        parameters = params.get("parameters", {})
+        _check_parameters(parameters)
+        include_correlation = bool(params.get("include_correlation", False))
+        key = json.dumps(["calculate", parameters, include_correlation], sort_keys=True)
+        loop = asyncio.get_running_loop()
+
+        async def factory(broadcast):
+            return await loop.run_in_executor(self.executor, calculate_point, parameters, include_correlation)
+        return await self._coalesce(key, factory, notify)
+
+    async def sweep(self, params: dict, notify):
+        average_count = int(params.get("average_count", 1))
+        base = params.get("base")
+        _check_parameters(base, params.get("ranges"), params.get("axes"))
+        if "ranges" in params:
+            ranges = {name: value if name == MOD_TYPE_AXIS else tuple(value)
+                      for name, value in params["ranges"].items()}
+            plan = SweepPlan.latin_hypercube(ranges, int(params["count"]), int(params.get("seed", 0)))
+        else:
+            plan = SweepPlan.cartesian(params.get("axes", {}))
+        units = plan.units(average_count, base)
+        key = json.dumps(["sweep", sorted(units), plan.shape], sort_keys=True)
+        loop = asyncio.get_running_loop()
+
+        async def run(unit_key: str, unit: dict):
+            return unit_key, await loop.run_in_executor(self.executor, run_unit, unit_key, unit["params"],
+                                                        average_count)
+
+        async def factory(broadcast):
+            cache = {}
+            for future in asyncio.as_completed([run(unit_key, unit) for unit_key, unit in units.items()]):
+                unit_key, result = await future
+                cache[unit_key] = result
+                await broadcast({"done": len(cache), "total": len(units)})
+            results = collect_results(plan, units, cache)
+            return {"axes": plan.axes,
+                    "shape": list(plan.shape),
+                    "results": {name: results[name].tolist() for name in SWEEP_METRICS}}
+        return await self._coalesce(key, factory, notify)
+
+    async def status(self, params: dict, notify):
+        return {"jobs": len(self.jobs), "pid": os.getpid()}
+
+    async def dispatch(self, request: dict, notify):
+        if request.get("method") not in self.METHODS:
+            raise RpcError(METHOD_NOT_FOUND, f"Неизвестный метод: {request.get('method')}")
+        method = getattr(self, request["method"])
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "Параметры должны быть объектом")
+        try:
+            return await method(params, notify)
+        except (KeyError, TypeError, ValueError) as error:
+            raise RpcError(INVALID_PARAMS, str(error))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Обработка соединения: запросы одного клиента выполняются параллельно.
+        """
+        lock = asyncio.Lock()
+
+        async def send(message: dict):
+            async with lock:
+                writer.write(json.dumps({"jsonrpc": "2.0", **message}).encode() + b"\n")
+                await writer.drain()
+
+        async def process(line: bytes):
+            request_id = None
+            try:
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    raise RpcError(PARSE_ERROR, str(error))
+                request_id = request.get("id")
+
+                async def notify(params: dict):
+                    await send({"method": "progress", "params": {"id": request_id, **params}})
+                result = await self.dispatch(request, notify)
+                await send({"id": request_id, "result": result})
+            except RpcError as error:
+                await send({"id": request_id, "error": {"code": error.code, "message": str(error)}})
+            except ConnectionError:
+                pass
+            except Exception as error:
+                await send({"id": request_id, "error": {"code": INTERNAL_ERROR, "message": repr(error)}})
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(process(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_SERVICE_HOST, port: int = DEFAULT_SERVICE_PORT, path: str = None):
+        """
+        Запустить сервис на TCP-порту или, при заданном path, на Unix-сокете.
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path, limit=MAX_REQUEST_SIZE)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_REQUEST_SIZE)
+        print(f"Сервис вычислений запущен: {path or f'{host}:{port}'}")
+        async with server:
+            await server.serve_forever()
+
+
+def call(method: str, params: dict = None, host: str = DEFAULT_SERVICE_HOST, port: int = DEFAULT_SERVICE_PORT,
+         path: str = None, on_progress=None):
+    """
+    Синхронный вызов метода сервиса.
+
+    :param on_progress: Функция, получающая уведомления о ходе выполнения.
+    """
+    if path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+    else:
+        connection = socket.create_connection((host, port))
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}).encode() + b"\n")
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if message.get("method") == "progress":
+                if on_progress is not None:
+                    on_progress(message["params"])
+                continue
+            if "error" in message:
+                raise RuntimeError(message["error"]["message"])
+            return message["result"]
+    raise ConnectionError("Соединение закрыто сервисом")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервис вычислений SignalGenerator (JSON-RPC)")
+    parser.add_argument("--host", default=DEFAULT_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVICE_PORT)
+    parser.add_argument("--unix", default=None, metavar="PATH", help="Unix-сокет вместо TCP")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    service = ComputeService(args.processes)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
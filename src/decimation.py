@@ -0,0 +1,49 @@
+import functools
+import numpy as np
+
+from fractional_delay import blackman_window
+
+# Половина длины фильтра в отсчётах выходной частоты дискретизации
+DEFAULT_DECIMATION_HALF_TAPS = 8
+# Запас выходной частоты дискретизации относительно удвоенной максимальной частоты сигнала
+DEFAULT_DECIMATION_MARGIN = 1.25
+
+
+@functools.lru_cache(maxsize=8)
+def decimation_filter(factor: int, half_taps: int = DEFAULT_DECIMATION_HALF_TAPS):
+    """
+    Коэффициенты ФНЧ (sinc с окном Блэкмана) с частотой среза, равной
+    половине выходной частоты дискретизации.
+    """
+    half_width = half_taps * factor
+    x = np.arange(-half_width, half_width + 1) / factor
+    taps = np.sinc(x) * blackman_window(x, half_taps)
+    return taps / taps.sum()
+
+
+def decimation_factor(sampling_rate: float, max_freq: float, margin: float = DEFAULT_DECIMATION_MARGIN):
+    """
+    Наибольший коэффициент прореживания, при котором частота дискретизации
+    остаётся не меньше 2 * max_freq * margin.
+    """
+    return max(int(sampling_rate // (2. * max_freq * margin)), 1)
+
+
+def decimate(values, factor: int, half_taps: int = DEFAULT_DECIMATION_HALF_TAPS):
+    """
+    Прореживание сигнала в factor раз с предварительной фильтрацией.
+
+    Вычисляются только сохраняемые отсчёты: окна сигнала с шагом factor
+    (без копирования) умножаются на коэффициенты фильтра, что эквивалентно
+    многофазной реализации. Отсчёт m результата соответствует отсчёту
+    m * factor исходного сигнала (задержка фильтра скомпенсирована).
+    """
+    values = np.asarray(values)
+    if factor == 1:
+        return values
+    taps = decimation_filter(factor, half_taps)
+    half_width = taps.size // 2
+    padded = np.pad(values, half_width)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, taps.size)[::factor]
+    # Фильтр симметричен, поэтому свёртка совпадает с корреляцией
+    return windows @ taps
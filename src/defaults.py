@@ -5,6 +5,7 @@ DURATION_SIDE_MENU = 600
 DURATION_MAXIMIZED = 400
 OPEN_MENU_ICON = "../icons/side_menu.png"
 HIDE_MENU_ICON = "../icons/back_menu.png"
+PROFILE_PANEL_HEIGHT = 150
 
 # Параметры задачи
 DEFAULT_SAMPLING_RATE = "2000"
@@ -15,3 +16,32 @@ DEFAULT_TIME_DELAY = "200"
 DEFAULT_SNR = "10"
 DEFAULT_AVERAGE_COUNT = "500"
 DEFAULT_DOPPLER = "1"
+
+# Параметры вычислений
+# Произведение полосы девиации на длительность бита для манипуляции направлением ЛЧМ
+DEFAULT_CHIRP_BT = 10.
+# Количество отсчётов задержки в блоке при расчёте функции неопределенности
+DEFAULT_TILE_SIZE = 256
+# Коэффициент прореживания сигналов перед корреляцией (1 - без прореживания, None - автоматически)
+DEFAULT_DECIMATION = 1
+# Количество потоков для вычисления БПФ функции неопределенности (1 - без пула потоков)
+DEFAULT_FFT_WORKERS = 1
+# Гипотезы доплеровского смещения для банка корреляторов, Гц
+DEFAULT_DOPPLER_BANK_MAX = 5.
+DEFAULT_DOPPLER_BANK_STEP = 0.25
+# Количество гипотез, обрабатываемых одним пакетным БПФ
+DEFAULT_DOPPLER_BANK_TILE = 32
+# Показатель степени спектра окрашенного шума (1 / |f|^exponent)
+DEFAULT_NOISE_EXPONENT = 1.
+# Вероятность импульса и отношение мощности импульсов к фоновому шуму
+DEFAULT_IMPULSE_PROBABILITY = 0.01
+DEFAULT_IMPULSE_RATIO = 100.
+# Частота гармонической помехи, Гц, и отношение её мощности к белому шуму
+DEFAULT_INTERFERENCE_FREQ = 50.
+DEFAULT_INTERFERENCE_RATIO = 1.
+# Параметры обнаружения пиков CFAR (по осям доплеровской частоты и задержки), отсчётов;
+# None - защитная зона по задержке равна полуширине главного лепестка корреляции
+DEFAULT_CFAR_GUARD = (2, None)
+DEFAULT_CFAR_TRAIN = (4, 40)
+# Порог обнаружения CFAR, дБ
+DEFAULT_CFAR_THRESHOLD = 13.
@@ -0,0 +1,107 @@
+import time
+import numpy as np
+
+from stream_correlation import matched_filter
+
+
+class DelayDopplerTracker:
+    """
+    Непрерывная оценка временной задержки и доплеровской частоты по
+    последовательно поступающим блокам исследуемого сигнала.
+
+    Между блоками сохраняются спектр эталонного сигнала и положение
+    предыдущего максимума: после захвата цели корреляция вычисляется только
+    в окне поиска вокруг него, а доплеровская частота - по одному столбцу
+    функции неопределенности в найденной задержке.
+    """
+    def __init__(self, reference: np.ndarray, timestep: float, search_radius: int = 50,
+                 reacquire_ratio: float = 0.5):
+        self.reference = np.asarray(reference)
+        self.reference_conj = np.conj(self.reference)
+        self.timestep = timestep
+        # Полуширина окна поиска вокруг предыдущего максимума, отсчётов
+        self.search_radius = search_radius
+        # Доля предыдущего максимума, ниже которой выполняется повторный захват
+        self.reacquire_ratio = reacquire_ratio
+
+        # Спектры эталонного сигнала для использованных размеров БПФ
+        self.reference_fft = {}
+        # Значения доплеровской частоты по возрастанию
+        self.doppler_list = np.fft.fftshift(np.fft.fftfreq(self.reference.size, d=timestep))
+
+        # Состояние сопровождения
+        self.peak_lag = None
+        self.peak_value = 0.
+        # Временной ряд оценок
+        self.history = []
+
+    @classmethod
+    def from_generator(cls, signal_generator, **kwargs):
+        """
+        Создать объект сопровождения для эталонного сигнала генератора.
+        """
+        reference = signal_generator.reference_mod
+        return cls(np.array(reference[1]), reference[0][1] - reference[0][0], **kwargs)
+
+    def _full_search(self, block: np.ndarray):
+        """
+        Корреляция по всем задержкам через БПФ.
+        """
+        return 0, np.abs(matched_filter(block, self.reference, self.reference_fft))
+
+    def _window_search(self, block: np.ndarray):
+        """
+        Корреляция только для задержек в окне вокруг предыдущего максимума
+        (пустая, если окно не пересекается с задержками блока).
+        """
+        count = block.size - self.reference.size + 1
+        from_lag = max(self.peak_lag - self.search_radius, 0)
+        to_lag = min(self.peak_lag + self.search_radius + 1, count)
+        windows = np.lib.stride_tricks.sliding_window_view(block, self.reference.size)[from_lag:to_lag]
+        return from_lag, np.abs(windows @ self.reference_conj)
+
+    def process(self, block: np.ndarray):
+        """
+        Обработать очередной блок и добавить оценку во временной ряд.
+        """
+        start_time = time.perf_counter()
+        block = np.asarray(block)
+        if block.size < self.reference.size:
+            raise ValueError(f"Длина блока ({block.size}) меньше длины эталонного сигнала ({self.reference.size})")
+
+        # Поиск максимума корреляции
+        acquired = self.peak_lag is None
+        if acquired:
+            from_lag, correlation = self._full_search(block)
+        else:
+            from_lag, correlation = self._window_search(block)
+            # Окно поиска вне блока (блок короче предыдущего) или максимум потерян
+            if correlation.size == 0 or correlation.max() < self.reacquire_ratio * self.peak_value:
+                acquired = True
+                from_lag, correlation = self._full_search(block)
+        max_idx = np.argmax(correlation)
+        self.peak_lag = from_lag + max_idx
+        self.peak_value = correlation[max_idx]
+
+        # Оценка доплеровской частоты по столбцу функции неопределенности
+        mul = block[self.peak_lag:self.peak_lag + self.reference.size] * self.reference_conj
+        fourier = np.fft.fftshift(np.abs(np.fft.fft(mul)))
+        doppler = self.doppler_list[np.argmax(fourier)]
+
+        latency = time.perf_counter() - start_time
+        estimate = {"time_delay": self.peak_lag * self.timestep * 1000,
+                    "doppler": doppler,
+                    "peak_value": self.peak_value,
+                    "acquired": acquired,
+                    "latency": latency,
+                    "samples_per_second": block.size / latency if latency > 0 else np.inf}
+        self.history.append(estimate)
+        return estimate
+
+    def reset(self):
+        """
+        Сбросить состояние сопровождения и временной ряд оценок.
+        """
+        self.peak_lag = None
+        self.peak_value = 0.
+        self.history = []
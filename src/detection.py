@@ -0,0 +1,146 @@
+import numpy as np
+
+from array_storage import iter_tiles
+from enums import CfarType
+
+# Количество ячеек, для которых уровень шума OS-CFAR вычисляется за один блок
+OS_CFAR_TILE = 1024
+# Запас порога предварительного отбора ячеек по уровню шума CA-CFAR для OS-CFAR, дБ
+OS_CFAR_PRESCREEN_MARGIN = 6.
+
+
+def _window_sums_1d(values: np.ndarray, half: int):
+    """
+    Суммы значений в окнах [i - half, i + half] (с обрезкой на краях) и количество
+    отсчётов в них, вычисленные по накопленной сумме.
+    """
+    cumsum = np.concatenate(([0.], np.cumsum(values)))
+    idx = np.arange(values.size)
+    lo = np.clip(idx - half, 0, values.size)
+    hi = np.clip(idx + half + 1, 0, values.size)
+    return cumsum[hi] - cumsum[lo], hi - lo
+
+
+def _window_sums_2d(values: np.ndarray, half: tuple):
+    """
+    Суммы значений в прямоугольных окнах (с обрезкой на краях) и количество
+    отсчётов в них, вычисленные по интегральному изображению.
+    """
+    integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1))
+    integral[1:, 1:] = values.cumsum(axis=0).cumsum(axis=1)
+    rows, cols = np.arange(values.shape[0]), np.arange(values.shape[1])
+    r_lo = np.clip(rows - half[0], 0, values.shape[0])[:, np.newaxis]
+    r_hi = np.clip(rows + half[0] + 1, 0, values.shape[0])[:, np.newaxis]
+    c_lo = np.clip(cols - half[1], 0, values.shape[1])[np.newaxis, :]
+    c_hi = np.clip(cols + half[1] + 1, 0, values.shape[1])[np.newaxis, :]
+    sums = integral[r_hi, c_hi] - integral[r_lo, c_hi] - integral[r_hi, c_lo] + integral[r_lo, c_lo]
+    return sums, (r_hi - r_lo) * (c_hi - c_lo)
+
+
+def ca_cfar_noise(values: np.ndarray, guard, train):
+    """
+    Оценка уровня шума CA-CFAR: среднее по обучающим ячейкам вокруг каждой
+    ячейки (за вычетом защитной зоны). Работает для одно- и двумерных массивов
+    за линейное время.
+    """
+    if values.ndim == 1:
+        outer_sums, outer_counts = _window_sums_1d(values, guard + train)
+        inner_sums, inner_counts = _window_sums_1d(values, guard)
+    else:
+        outer = (guard[0] + train[0], guard[1] + train[1])
+        outer_sums, outer_counts = _window_sums_2d(values, outer)
+        inner_sums, inner_counts = _window_sums_2d(values, guard)
+    return (outer_sums - inner_sums) / np.maximum(outer_counts - inner_counts, 1)
+
+
+def os_cfar_noise(values: np.ndarray, guard, train, cells: tuple, rank: float = 0.75):
+    """
+    Оценка уровня шума OS-CFAR: значение заданного ранга (доли) среди
+    обучающих ячеек вокруг каждой из проверяемых ячеек cells.
+
+    Упорядочивание требует обработки всего окна (время не линейно по размеру
+    окна), поэтому уровень шума вычисляется только для проверяемых ячеек
+    (блоками по OS_CFAR_TILE).
+    """
+    if values.ndim == 1:
+        guard, train = (guard,), (train,)
+    half = tuple(g + t for g, t in zip(guard, train))
+    padded = np.pad(values, [(h, h) for h in half], mode="reflect")
+    shape = tuple(2 * h + 1 for h in half)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, shape)
+    mask = np.ones(shape, dtype=bool)
+    mask[tuple(slice(t, t + 2 * g + 1) for g, t in zip(guard, train))] = False
+    k = int(rank * (mask.sum() - 1))
+
+    noise = np.empty(cells[0].size)
+    for start, stop in iter_tiles(cells[0].size, OS_CFAR_TILE):
+        block = windows[tuple(idx[start:stop] for idx in cells)][:, mask]
+        noise[start:stop] = np.partition(block, k, axis=1)[:, k]
+    return noise
+
+
+def _local_maxima(values: np.ndarray):
+    """
+    Маска локальных максимумов (по соседним ячейкам).
+    """
+    padded = np.pad(values, 1, mode="constant", constant_values=-np.inf)
+    shape = (3,) * values.ndim
+    return values >= np.lib.stride_tricks.sliding_window_view(padded, shape).max(axis=tuple(range(-values.ndim, 0)))
+
+
+def merge_peaks(cells: tuple, separation):
+    """
+    Объединение пиков, находящихся в пределах одного главного лепестка.
+
+    :param cells: Индексы пиков, упорядоченных по убыванию.
+    :param separation: Полуширина главного лепестка (для матрицы - по каждой оси).
+    :return: Маска пиков, не попадающих в главный лепесток более сильного пика.
+    """
+    points = np.stack(cells, axis=-1)
+    keep = np.zeros(len(points), dtype=bool)
+    merged = np.zeros(len(points), dtype=bool)
+    for idx in range(len(points)):
+        if merged[idx]:
+            continue
+        keep[idx] = True
+        merged |= np.all(np.abs(points - points[idx]) <= separation, axis=1)
+    return keep
+
+
+def cfar_detect(values: np.ndarray, cfar_type: CfarType, guard, train, threshold: float, separation=None):
+    """
+    Обнаружение пиков с постоянным уровнем ложных тревог.
+
+    Для OS-CFAR уровень шума упорядочиванием вычисляется только для ячеек,
+    прошедших предварительный отбор по уровню CA-CFAR с порогом, сниженным
+    на OS_CFAR_PRESCREEN_MARGIN.
+
+    :param values: Модуль корреляционной функции или функции неопределенности.
+    :param cfar_type: Способ оценки уровня шума.
+    :param guard: Размер защитной зоны (для матрицы - по каждой оси).
+    :param train: Размер обучающей зоны (для матрицы - по каждой оси).
+    :param threshold: Порог превышения мощности над уровнем шума, дБ.
+    :param separation: Полуширина главного лепестка (для матрицы - по каждой
+                       оси): пики в пределах главного лепестка более сильного
+                       пика объединяются с ним (None - без объединения).
+    :return: Индексы обнаруженных пиков и отношения сигнал/шум в них, дБ (по убыванию).
+    """
+    power = np.asarray(values, dtype=float) ** 2
+    # Проверяются только локальные максимумы
+    cells = np.nonzero(_local_maxima(power))
+    if cfar_type not in (CfarType.CA, CfarType.OS):
+        raise ValueError(f"Неизвестный тип CFAR: {cfar_type}")
+    noise = ca_cfar_noise(power, guard, train)[cells]
+    if cfar_type == CfarType.OS:
+        prescreen = power[cells] > noise * 10 ** ((threshold - OS_CFAR_PRESCREEN_MARGIN) / 10)
+        cells = tuple(idx[prescreen] for idx in cells)
+        noise = os_cfar_noise(power, guard, train, cells)
+
+    snr = 10 * np.log10(power[cells] / np.maximum(noise, np.finfo(float).tiny))
+    detected = snr > threshold
+    order = np.argsort(snr[detected])[::-1]
+    cells, snr = tuple(idx[detected][order] for idx in cells), snr[detected][order]
+    if separation is not None and snr.size:
+        keep = merge_peaks(cells, separation)
+        cells, snr = tuple(idx[keep] for idx in cells), snr[keep]
+    return cells, snr
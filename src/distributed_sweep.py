@@ -0,0 +1,286 @@
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import time
+import zlib
+
+from sweep import (SweepPlan, SWEEP_METRICS, run_trials, default_priority, load_cache, save_cache,
+                   collect_results, add_plan_arguments, build_plan, save_results)
+
+# Количество испытаний в одном задании очереди
+DEFAULT_CHUNK = 50
+# Время без отметки активности, после которого задание возвращается в очередь, с
+DEFAULT_TASK_TIMEOUT = 60.
+# Период опроса очереди, с
+DEFAULT_POLL_INTERVAL = 0.5
+# Количество попыток выполнения задания
+MAX_ATTEMPTS = 3
+
+
+class FileQueue:
+    """
+    Очередь заданий в общем каталоге (например, на сетевом диске).
+
+    Задание - файл JSON, переходящий между подкаталогами pending -> running ->
+    done. Захват задания выполняется атомарным переименованием, поэтому одно
+    задание получает только один исполнитель. Исполнитель обновляет время
+    изменения файла в running после каждого испытания; задания без отметок
+    дольше тайм-аута возвращаются в pending.
+    """
+    STATES = ("pending", "running", "done", "failed")
+
+    def __init__(self, root: str):
+        self.root = root
+        for state in self.STATES:
+            os.makedirs(os.path.join(root, state), exist_ok=True)
+
+    def _path(self, state: str, task_id: str):
+        return os.path.join(self.root, state, task_id + ".json")
+
+    def _write(self, state: str, task_id: str, data: dict):
+        path = self._path(state, task_id)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(path + ".tmp", path)
+
+    def _ids(self, state: str):
+        return sorted(name[:-5] for name in os.listdir(os.path.join(self.root, state)) if name.endswith(".json"))
+
+    def clear(self):
+        """
+        Удалить все задания и признак остановки.
+        """
+        for state in self.STATES:
+            shutil.rmtree(os.path.join(self.root, state))
+            os.makedirs(os.path.join(self.root, state))
+        if self.stopped():
+            os.remove(os.path.join(self.root, "stop"))
+
+    def put(self, task_id: str, task: dict):
+        """
+        Поставить задание в очередь.
+        """
+        self._write("pending", task_id, task)
+
+    def claim(self):
+        """
+        Захватить первое свободное задание.
+
+        :return: Идентификатор и описание задания или None, если очередь пуста.
+        """
+        for task_id in self._ids("pending"):
+            try:
+                os.rename(self._path("pending", task_id), self._path("running", task_id))
+            except FileNotFoundError:
+                # Задание захвачено другим исполнителем
+                continue
+            with open(self._path("running", task_id), "r", encoding="utf-8") as file:
+                return task_id, json.load(file)
+        return None
+
+    def heartbeat(self, task_id: str):
+        """
+        Отметить активность исполнителя задания.
+        """
+        try:
+            os.utime(self._path("running", task_id))
+        except FileNotFoundError:
+            # Задание уже возвращено в очередь
+            pass
+
+    def _release(self, task_id: str):
+        try:
+            os.remove(self._path("running", task_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, task_id: str, result: dict):
+        """
+        Сохранить результат задания.
+        """
+        self._write("done", task_id, result)
+        self._release(task_id)
+
+    def fail(self, task_id: str, task: dict, error: str):
+        """
+        Вернуть задание в очередь после ошибки (или отметить как невыполнимое
+        после MAX_ATTEMPTS попыток).
+        """
+        task = {**task, "attempts": task.get("attempts", 0) + 1, "error": error}
+        self._write("failed" if task["attempts"] >= MAX_ATTEMPTS else "pending", task_id, task)
+        self._release(task_id)
+
+    def requeue_stale(self, timeout: float):
+        """
+        Вернуть в очередь задания, исполнители которых не отмечались дольше timeout.
+
+        :return: Идентификаторы возвращённых заданий.
+        """
+        requeued = []
+        for task_id in self._ids("running"):
+            path = self._path("running", task_id)
+            try:
+                if time.time() - os.path.getmtime(path) < timeout:
+                    continue
+                with open(path, "r", encoding="utf-8") as file:
+                    task = json.load(file)
+            except FileNotFoundError:
+                continue
+            self.fail(task_id, task, "превышено время ожидания исполнителя")
+            requeued.append(task_id)
+        return requeued
+
+    def results(self):
+        """
+        Результаты выполненных заданий.
+        """
+        results = {}
+        for task_id in self._ids("done"):
+            with open(self._path("done", task_id), "r", encoding="utf-8") as file:
+                results[task_id] = json.load(file)
+        return results
+
+    def failed(self):
+        return self._ids("failed")
+
+    def stop(self):
+        """
+        Сообщить исполнителям о завершении работы.
+        """
+        open(os.path.join(self.root, "stop"), "w").close()
+
+    def stopped(self):
+        return os.path.exists(os.path.join(self.root, "stop"))
+
+
+def worker_loop(queue_dir: str, name: str = None, poll: float = DEFAULT_POLL_INTERVAL):
+    """
+    Исполнитель: выполнять задания из очереди до сигнала остановки.
+
+    :return: Количество выполненных заданий.
+    """
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    queue = FileQueue(queue_dir)
+    processed = 0
+    while not queue.stopped():
+        claimed = queue.claim()
+        if claimed is None:
+            time.sleep(poll)
+            continue
+        task_id, task = claimed
+        try:
+            sums = run_trials(f"{task['key']}#{task['chunk']}", task["params"], task["count"],
+                              progress=lambda: queue.heartbeat(task_id))
+        except Exception as error:
+            queue.fail(task_id, task, f"{name}: {error!r}")
+            continue
+        queue.complete(task_id, {"key": task["key"], "count": task["count"], "sums": sums, "worker": name})
+        processed += 1
+    return processed
+
+
+def merge_partials(partials: list):
+    """
+    Объединить частичные суммы испытаний в средние значения.
+    """
+    count = sum(partial["count"] for partial in partials)
+    return {name: sum(partial["sums"][name] for partial in partials) / count for name in SWEEP_METRICS}
+
+
+def run_distributed_sweep(plan: SweepPlan, average_count: int, queue_dir: str, base: dict = None,
+                          chunk: int = DEFAULT_CHUNK, local_workers: int = 0, cache_path: str = None,
+                          timeout: float = DEFAULT_TASK_TIMEOUT, poll: float = DEFAULT_POLL_INTERVAL,
+                          priority=default_priority):
+    """
+    Координатор распределённого исследования.
+
+    Каждое задание плана, отсутствующее в кэше, разбивается на части по chunk
+    испытаний, которые ставятся в очередь в порядке приоритета. Части
+    выполняются исполнителями worker_loop (локальными процессами или на других
+    узлах с доступом к queue_dir), а их суммы объединяются в средние значения.
+
+    :param local_workers: Количество локальных процессов-исполнителей
+                          (завершившиеся аварийно перезапускаются).
+    :return: Словарь: название результата -> массив размером plan.shape.
+    """
+    units = plan.units(average_count, base)
+    cache = load_cache(cache_path)
+    queue = FileQueue(queue_dir)
+    queue.clear()
+
+    remaining = {}
+    keys = sorted((key for key in units if key not in cache),
+                  key=lambda key: priority(units[key]["params"], average_count))
+    for rank, key in enumerate(keys):
+        chunks = [min(chunk, average_count - start) for start in range(0, average_count, chunk)]
+        remaining[key] = len(chunks)
+        for idx, count in enumerate(chunks):
+            task_id = f"{rank:06d}_{zlib.crc32(key.encode()):08x}_{idx:04d}"
+            queue.put(task_id, {"key": key, "params": units[key]["params"], "count": count, "chunk": idx})
+    print(f"Заданий: {len(units)}, из кэша: {len(units) - len(keys)}")
+
+    workers = []
+
+    def start_worker(idx: int):
+        process = multiprocessing.Process(target=worker_loop, args=(queue_dir, f"local-{idx}", poll), daemon=True)
+        process.start()
+        return process
+
+    try:
+        workers = [start_worker(idx) for idx in range(local_workers)]
+        partials, merged = {}, set()
+        while remaining:
+            for task_id in queue.requeue_stale(timeout):
+                print(f"Задание {task_id} возвращено в очередь")
+            if queue.failed():
+                raise RuntimeError(f"Не удалось выполнить задания: {', '.join(queue.failed())}")
+            for task_id, result in queue.results().items():
+                if task_id in merged:
+                    continue
+                merged.add(task_id)
+                key = result["key"]
+                partials.setdefault(key, []).append(result)
+                remaining[key] -= 1
+                if not remaining[key]:
+                    cache[key] = merge_partials(partials.pop(key))
+                    del remaining[key]
+                    save_cache(cache_path, cache)
+            for idx, process in enumerate(workers):
+                if not process.is_alive():
+                    workers[idx] = start_worker(idx)
+            if remaining:
+                time.sleep(poll)
+    finally:
+        queue.stop()
+        for process in workers:
+            process.join()
+    return collect_results(plan, units, cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Распределённое исследование по сетке параметров SignalGenerator")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    coordinator = subparsers.add_parser("coordinator", help="разбить план на задания и собрать результаты")
+    add_plan_arguments(coordinator)
+    coordinator.add_argument("--queue", required=True, help="общий каталог очереди заданий")
+    coordinator.add_argument("--chunk", type=int, default=DEFAULT_CHUNK)
+    coordinator.add_argument("--workers", type=int, default=0, help="количество локальных исполнителей")
+    coordinator.add_argument("--timeout", type=float, default=DEFAULT_TASK_TIMEOUT)
+    worker = subparsers.add_parser("worker", help="выполнять задания из очереди")
+    worker.add_argument("--queue", required=True)
+    args = parser.parse_args()
+
+    if args.mode == "worker":
+        print(f"Выполнено заданий: {worker_loop(args.queue)}")
+        return
+    plan = build_plan(args)
+    results = run_distributed_sweep(plan, args.average, args.queue, chunk=args.chunk, local_workers=args.workers,
+                                    cache_path=args.cache, timeout=args.timeout)
+    save_results(args.output, plan, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,3 +35,57 @@ class ModulationType(Enum):
     AM = 0
     FM = 1
     PM = 2
+    BPSK = 3
+    QPSK = 4
+    MSK = 5
+    CHIRP = 6
+    LFM = 7
+    MSEQUENCE = 8
+    GOLD = 9
+    BARKER = 10
+    FRANK = 11
+
+
+class CorrelationMode(Enum):
+    """
+    Способы вычисления взаимной корреляционной функции.
+    """
+    DIRECT = 0
+    DOPPLER_BANK = 1
+
+
+class DelayModel(Enum):
+    """
+    Способы формирования задержанного эталонного сигнала в исследуемом.
+    """
+    BIT = 0
+    FRACTIONAL = 1
+
+
+class NoiseType(Enum):
+    """
+    Модели шума.
+    """
+    LEGACY = 0
+    AWGN = 1
+    COLORED = 2
+    IMPULSIVE = 3
+    INTERFERENCE = 4
+
+
+class CfarType(Enum):
+    """
+    Способы оценки уровня шума при обнаружении пиков (CFAR).
+    """
+    CA = 0
+    OS = 1
+
+
+class IqFormat(Enum):
+    """
+    Форматы файлов с записанными отсчётами I/Q.
+    """
+    INT16 = 0
+    FLOAT32 = 1
+    COMPLEX64 = 2
+    NPY = 3
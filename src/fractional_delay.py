@@ -0,0 +1,53 @@
+import functools
+import numpy as np
+
+# Половина количества коэффициентов интерполирующего фильтра
+DEFAULT_INTERP_HALF_TAPS = 8
+# Количество фаз (шаг дробной задержки 1 / phases отсчёта)
+DEFAULT_INTERP_PHASES = 512
+
+
+def blackman_window(x: np.ndarray, half_width: float):
+    """
+    Окно Блэкмана, центрированное в нуле, шириной 2 * half_width.
+    """
+    window = 0.42 + 0.5 * np.cos(np.pi * x / half_width) + 0.08 * np.cos(2. * np.pi * x / half_width)
+    return np.where(np.abs(x) < half_width, window, 0.)
+
+
+@functools.lru_cache(maxsize=8)
+def interpolation_bank(half_taps: int = DEFAULT_INTERP_HALF_TAPS, phases: int = DEFAULT_INTERP_PHASES):
+    """
+    Многофазный банк интерполирующих фильтров (sinc с окном Блэкмана).
+
+    Строка p - коэффициенты для дробной задержки p / phases при отсчётах
+    с номерами floor(x) - half_taps + 1 ... floor(x) + half_taps.
+    """
+    offsets = np.arange(-half_taps + 1, half_taps + 1)
+    x = offsets[np.newaxis, :] - (np.arange(phases) / phases)[:, np.newaxis]
+    bank = np.sinc(x) * blackman_window(x, half_taps)
+    return bank / bank.sum(axis=1, keepdims=True)
+
+
+def resample_at(values: np.ndarray, positions: np.ndarray,
+                half_taps: int = DEFAULT_INTERP_HALF_TAPS, phases: int = DEFAULT_INTERP_PHASES):
+    """
+    Значения сигнала в дробных позициях (в отсчётах), полученные
+    многофазной интерполяцией с ограниченной полосой.
+
+    Позиции могут быть произвольными, поэтому одним вызовом выполняется и
+    дробная задержка, и масштабирование времени. За пределами сигнала
+    отсчёты считаются нулевыми.
+    """
+    positions = np.asarray(positions, dtype=float)
+    base = np.floor(positions).astype(np.int64)
+    phase = np.rint((positions - base) * phases).astype(np.int64)
+    # Дробная часть, округлённая до единицы, относится к следующему отсчёту
+    carry = phase == phases
+    base[carry] += 1
+    phase[carry] = 0
+
+    padded = np.pad(values, half_taps + 1)
+    offsets = np.arange(-half_taps + 1, half_taps + 1)
+    indices = np.clip(base[:, np.newaxis] + offsets + half_taps + 1, 0, padded.size - 1)
+    return np.einsum("ij,ij->i", padded[indices], interpolation_bank(half_taps, phases)[phase])
@@ -0,0 +1,99 @@
+import numpy as np
+
+from enums import IqFormat
+
+# Масштаб для приведения 16-битных отсчётов к диапазону [-1, 1)
+INT16_SCALE = 1. / 32768.
+
+
+class SampleTimes:
+    """
+    Временные отсчёты записанного сигнала, вычисляемые по индексу.
+
+    Заменяет список моментов времени, чтобы для многогигабайтных записей
+    не создавался массив той же длины, что и сам сигнал.
+    """
+    def __init__(self, count: int, timestep: float):
+        self.count = count
+        self.timestep = timestep
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return np.arange(*item.indices(self.count)) * self.timestep
+        if item < 0:
+            item += self.count
+        if not 0 <= item < self.count:
+            raise IndexError("Индекс временного отсчёта вне диапазона")
+        return item * self.timestep
+
+    def __array__(self, dtype=None, copy=None):
+        return np.arange(self.count, dtype=dtype) * self.timestep
+
+
+class Int16IqSamples:
+    """
+    Чередующиеся 16-битные отсчёты I/Q, отображённые в память.
+
+    Преобразование в комплексные числа выполняется только для запрошенного
+    диапазона отсчётов.
+    """
+    def __init__(self, raw: np.ndarray):
+        self.raw = raw
+        self.dtype = np.dtype(np.complex64)
+
+    def __len__(self):
+        return self.raw.shape[0]
+
+    @property
+    def size(self):
+        return self.raw.shape[0]
+
+    def __getitem__(self, item):
+        part = self.raw[item]
+        return (part[..., 0] + 1j * part[..., 1]).astype(np.complex64) * np.float32(INT16_SCALE)
+
+    def __array__(self, dtype=None, copy=None):
+        values = self[:]
+        return values if dtype is None else values.astype(dtype)
+
+
+def load_iq(path: str, iq_format: IqFormat, offset: int = 0, count: int = None):
+    """
+    Открыть файл с записанными отсчётами I/Q без копирования в память.
+
+    :param path: Путь к файлу.
+    :param iq_format: Формат отсчётов в файле.
+    :param offset: Номер первого комплексного отсчёта.
+    :param count: Количество отсчётов (None - до конца файла).
+    :return: Массив комплексных отсчётов, отображённый в память.
+    """
+    if iq_format == IqFormat.NPY:
+        samples = np.load(path, mmap_mode="r")
+        # Вещественный массив из пар I/Q интерпретируется как комплексный
+        if not np.iscomplexobj(samples):
+            if samples.ndim != 2 or samples.shape[1] != 2:
+                raise ValueError("Вещественный массив .npy должен иметь форму (N, 2)")
+            if samples.dtype == np.int16:
+                samples = Int16IqSamples(samples)
+            elif samples.dtype in (np.float32, np.float64):
+                complex_type = np.complex64 if samples.dtype == np.float32 else np.complex128
+                samples = np.ascontiguousarray(samples).view(complex_type)[:, 0]
+            else:
+                raise ValueError(f"Неподдерживаемый тип отсчётов .npy: {samples.dtype} "
+                                 f"(допустимы int16, float32, float64 и комплексные)")
+    elif iq_format == IqFormat.COMPLEX64:
+        samples = np.memmap(path, dtype=np.complex64, mode="r")
+    elif iq_format == IqFormat.FLOAT32:
+        samples = np.memmap(path, dtype=np.float32, mode="r").view(np.complex64)
+    elif iq_format == IqFormat.INT16:
+        samples = Int16IqSamples(np.memmap(path, dtype=np.int16, mode="r").reshape(-1, 2))
+    else:
+        raise ValueError(f"Неизвестный формат файла: {iq_format}")
+
+    stop = None if count is None else offset + count
+    if isinstance(samples, Int16IqSamples):
+        return Int16IqSamples(samples.raw[offset:stop])
+    return samples[offset:stop]
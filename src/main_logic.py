@@ -1,4 +1,5 @@
 import os
+import numpy as np
 
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from PyQt5 import QtCore, QtGui
@@ -6,6 +7,7 @@ from PyQt5 import QtCore, QtGui
 from main_interface import Ui_MainWindow
 from signals_generator import SignalGenerator
 from research_logic import calc_research_bad_alg
+from stage_profiler import StageProfiler
 from mpl_widget import *
 from enums import *
 from defaults import *
@@ -98,6 +100,17 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
         self.verticalLayout_12.addWidget(self.function_toolbar_2d)
         self.verticalLayout_12.addWidget(self.function_graphics_2d)
 
+        # Панель профилирования стадий расчёта
+        self.profile_checkbox = QtWidgets.QCheckBox("Профилирование стадий расчёта")
+        self.profile_panel = QtWidgets.QPlainTextEdit()
+        self.profile_panel.setReadOnly(True)
+        self.profile_panel.setMaximumHeight(PROFILE_PANEL_HEIGHT)
+        self.profile_panel.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        self.profile_panel.hide()
+        self.verticalLayout_16.addWidget(self.profile_checkbox)
+        self.verticalLayout_16.addWidget(self.profile_panel)
+        self.profile_checkbox.toggled.connect(self.profile_change_logic)
+
     def draw(self, graph_type: GraphType, x: list, y: list):
         """
         Нарисовать график.
@@ -119,7 +132,7 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
         self.graphics.draw()
         self.graphics.flush_events()
 
-    def draw_function_3d(self, x: list, y: list, z: list):
+    def draw_function_3d(self, x: np.ndarray, y: np.ndarray, z: np.ndarray):
         """
         Отобразить взаимную функцию неопределенности.
         """
@@ -167,13 +180,9 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
         # Расчёт функций
         self.signal_generator.calculate(mod_type)
         # Отображение эталонного сигнала
-        self.draw(GraphType.REFERENCE,
-                  self.signal_generator.reference_mod[0],
-                  self.signal_generator.reference_mod[1])
+        self.draw(GraphType.REFERENCE, *self.signal_generator.get_display_signal(self.signal_generator.reference_mod))
         # Отображение исследуемого сигнала
-        self.draw(GraphType.RESEARCH,
-                  self.signal_generator.research_mod[0],
-                  self.signal_generator.research_mod[1])
+        self.draw(GraphType.RESEARCH, *self.signal_generator.get_display_signal(self.signal_generator.research_mod))
         # Отображение корреляционной функции
         self.draw(GraphType.CORRELATION,
                   self.signal_generator.correlation[0],
@@ -182,9 +191,9 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
         # Вывод найденной оценки времени
         self.time_delay_assessment_edit.setText(str(self.signal_generator.found_time_delay))
         # Отображение взаимной функции неопределенности
-        self.draw_function_3d(self.signal_generator.fn3d[0],
-                              self.signal_generator.fn3d[1],
-                              self.signal_generator.fn3d[2])
+        self.draw_function_3d(self.signal_generator.fn3d.tao_list,
+                              self.signal_generator.fn3d.doppler_list,
+                              self.signal_generator.fn3d.values)
         self.draw_function_2d(GraphType.FUNCTION_TAO,
                               self.signal_generator.fn2d_tao[0],
                               self.signal_generator.fn2d_tao[1])
@@ -195,6 +204,7 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
         print("\nКритерий выраженности главного максимума:", self.signal_generator.criterion)
         print("Временная задержка из функции неопределенности, мс:", self.signal_generator.found_time_delay_f)
         print("Доплеровская частота из функции неопределенности, Гц:", self.signal_generator.found_doppler)
+        self.update_profile_panel()
 
     def start_research_logic(self):
         """
@@ -208,6 +218,22 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
 
         x, y = calc_research_bad_alg(average_count, self.signal_generator)
         self.draw_criterion_research(x, y)
+        self.update_profile_panel()
+
+    def update_profile_panel(self):
+        """
+        Вывод накопленных результатов профилирования.
+        """
+        if self.signal_generator.profiler is not None:
+            self.profile_panel.setPlainText(self.signal_generator.profiler.report())
+
+    def profile_change_logic(self, checked: bool):
+        """
+        Обработка события включения/отключения профилирования.
+        """
+        self.signal_generator.profiler = StageProfiler() if checked else None
+        self.profile_panel.clear()
+        self.profile_panel.setVisible(checked)
 
     def sr_change_logic(self):
         """
@@ -241,8 +267,10 @@ class MainApp(QtWidgets.QMainWindow, Ui_MainWindow):
         """
         Обработка события изменения значения в поле "Временная задержка, мс".
         """
-        if self.time_delay_edit.text().isdigit():
+        try:
             self.signal_generator.time_delay = float(self.time_delay_edit.text())
+        except ValueError:
+            pass
 
     def snr_change_logic(self):
         """
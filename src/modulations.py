@@ -0,0 +1,315 @@
+import numpy as np
+
+from codes import m_sequence, gold_code, barker_code, barker_order, frank_code, frank_order
+from enums import ModulationType
+
+# Реестр схем модуляции
+MODULATIONS = {}
+
+
+def register_modulation(mod_type: ModulationType):
+    """
+    Декоратор регистрации схемы модуляции для типа mod_type.
+    """
+    def decorator(cls):
+        MODULATIONS[mod_type] = cls()
+        return cls
+    return decorator
+
+
+def get_modulation(mod_type: ModulationType):
+    """
+    Получить схему модуляции по её типу.
+    """
+    if mod_type not in MODULATIONS:
+        raise ValueError(f"Неизвестный тип модуляции: {mod_type}")
+    return MODULATIONS[mod_type]
+
+
+def combine_phases(phase_i: np.ndarray, phase_q: np.ndarray, params: dict):
+    """
+    Сигнал I + jQ по полным фазам компонент: cos(phase_i) + j * cos(phase_q),
+    в режиме комплексной огибающей - (exp(j * phase_i) + j * exp(j * phase_q)) / 2.
+    """
+    if params["baseband"]:
+        return 0.5 * (np.exp(1j * phase_i) + 1j * np.exp(1j * phase_q))
+    return np.cos(phase_i) + 1j * np.cos(phase_q)
+
+
+class ModulationScheme:
+    """
+    Схема модуляции.
+
+    Каждое состояние символа задаётся комплексной огибающей e_s(t) относительно
+    несущей, а его шаблон - сигналом Re{e_s(t) * exp(j * w * t)} на временной
+    сетке. Шаблоны вычисляются один раз для параметров сигнала, а I и Q
+    компоненты собираются выбором шаблона по состоянию символа в каждом отсчёте.
+
+    В режиме комплексной огибающей (params["baseband"]) несущая исключается:
+    шаблон состояния - e_s(t) / 2, а сигнал - (e_i + j * e_q) / 2, т.е.
+    составляющая сигнала I + jQ на положительных частотах, перенесённая на
+    нулевую частоту.
+    """
+    def parameters(self, generator):
+        """
+        Параметры генератора, от которых зависят шаблоны (для кэширования).
+        """
+        return generator.signal_freq,
+
+    def symbols(self, bits: np.ndarray):
+        """
+        Преобразовать биты компоненты в состояния символов.
+        """
+        return bits
+
+    def bandwidth(self, generator):
+        """
+        Наибольшее отклонение частоты сигнала от несущей, Гц (с учётом главного
+        лепестка спектра манипуляции).
+        """
+        return generator.bits_per_second
+
+    def mainlobe(self, generator):
+        """
+        Полуширина главного лепестка корреляционной функции, сек: каждый бит
+        I и Q компонент повторяется дважды, т.е. занимает два интервала бита.
+        """
+        return 2. / generator.bits_per_second
+
+    def reference_code(self, generator, length: int):
+        """
+        Детерминированная последовательность состояний эталонного сигнала
+        длиной length (None - эталонный сигнал формируется из случайных битов).
+        """
+        return None
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        """
+        Комплексные огибающие всех состояний символа, размер (количество состояний, len(times)).
+        """
+        raise NotImplementedError
+
+    def templates(self, generator, times: np.ndarray, params: dict):
+        """
+        Шаблоны сигналов всех состояний символа на временной сетке.
+        """
+        if params["baseband"]:
+            envelopes = 0.5 * self.envelopes(generator, times, params)
+            return np.broadcast_to(envelopes, (envelopes.shape[0], times.size))
+        carrier = np.exp(1j * params["freq"] * times)
+        return np.real(self.envelopes(generator, times, params) * carrier)
+
+    def modulate(self, templates: np.ndarray, i_states: np.ndarray, q_states: np.ndarray, params: dict):
+        """
+        Собрать комплексный сигнал по шаблонам и состояниям символов в каждом отсчёте.
+        """
+        samples = np.arange(i_states.size)
+        return templates[i_states, samples] + 1j * templates[q_states, samples]
+
+
+@register_modulation(ModulationType.AM)
+class AmplitudeModulation(ModulationScheme):
+    """
+    Амплитудная манипуляция.
+    """
+    def parameters(self, generator):
+        return generator.signal_freq, generator.low_ampl, generator.high_ampl
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        return np.array([[generator.low_ampl], [generator.high_ampl]], dtype=complex)
+
+
+@register_modulation(ModulationType.PM)
+class PhaseModulation(ModulationScheme):
+    """
+    Фазовая манипуляция с фазами 3pi/4 и 7pi/4.
+    """
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        return np.exp(1j * np.array([[3. * np.pi / 4.], [7. * np.pi / 4.]]))
+
+
+@register_modulation(ModulationType.FM)
+class FrequencyModulation(ModulationScheme):
+    """
+    Частотная манипуляция: несущая частота и частота, умноженная на индекс модуляции.
+    """
+    def parameters(self, generator):
+        return generator.signal_freq, generator.mod_index
+
+    def bandwidth(self, generator):
+        return abs(generator.signal_freq * (generator.mod_index - 1.)) + generator.bits_per_second
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        offsets = np.array([[0.], [generator.signal_freq * (generator.mod_index - 1.)]])
+        return np.exp(2j * np.pi * offsets * times)
+
+
+@register_modulation(ModulationType.BPSK)
+class BinaryPhaseShiftKeying(ModulationScheme):
+    """
+    Двоичная фазовая манипуляция (0 и pi).
+    """
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        return np.array([[1.], [-1.]], dtype=complex)
+
+
+@register_modulation(ModulationType.QPSK)
+class QuadraturePhaseShiftKeying(ModulationScheme):
+    """
+    Квадратурная фазовая манипуляция: пара соседних битов компоненты задаёт
+    одну из четырёх фаз pi/4 + k*pi/2.
+    """
+    def symbols(self, bits: np.ndarray):
+        # Биты компоненты повторены дважды - берутся уникальные значения
+        unique = bits[0::2]
+        if unique.size % 2 != 0:
+            unique = np.append(unique, np.uint8(0))
+        states = 2 * unique[0::2] + unique[1::2]
+        return np.repeat(states, 4)[:bits.size]
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        return np.exp(1j * (np.pi / 4. + np.pi / 2. * np.arange(4)))[:, np.newaxis]
+
+
+@register_modulation(ModulationType.MSK)
+class MinimumShiftKeying(ModulationScheme):
+    """
+    Частотная манипуляция с минимальным сдвигом: фаза непрерывна и за время
+    бита изменяется на +-pi/2.
+
+    Фаза зависит от предыдущих символов, поэтому шаблоном служит только фаза
+    несущей, а огибающая вычисляется накоплением приращений фазы.
+    """
+    def templates(self, generator, times: np.ndarray, params: dict):
+        return np.zeros_like(times) if params["baseband"] else params["freq"] * times
+
+    def modulate(self, templates: np.ndarray, i_states: np.ndarray, q_states: np.ndarray, params: dict):
+        step = np.pi / 2. * params["timestep"] / params["bit_time"]
+        phase_i = np.cumsum(2. * i_states - 1.) * step
+        phase_q = np.cumsum(2. * q_states - 1.) * step
+        return combine_phases(templates + phase_i, templates + phase_q, params)
+
+
+@register_modulation(ModulationType.CHIRP)
+class ChirpKeying(ModulationScheme):
+    """
+    Манипуляция направлением ЛЧМ: в течение бита частота линейно растёт
+    (единица) или убывает (ноль) вокруг несущей в полосе chirp_bt * bits_per_second,
+    т.е. произведение полосы на длительность бита равно chirp_bt (при малых
+    значениях встречные ЛЧМ-сигналы слабо различимы).
+    """
+    def parameters(self, generator):
+        return generator.signal_freq, generator.chirp_bt
+
+    @staticmethod
+    def _chirp_bandwidth(generator):
+        return generator.chirp_bt * generator.bits_per_second
+
+    def bandwidth(self, generator):
+        return self._chirp_bandwidth(generator) / 2. + generator.bits_per_second
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        bit_time = params["bit_time"]
+        # Время от середины текущего бита
+        tau = times - (np.floor(times / bit_time) + 0.5) * bit_time
+        rate = np.array([[-1.], [1.]]) * generator.chirp_bt / bit_time ** 2
+        return np.exp(1j * np.pi * rate * tau ** 2)
+
+
+class CodeModulation(ModulationScheme):
+    """
+    Двоичная фазовая манипуляция кодом: эталонный сигнал в обеих компонентах
+    содержит код (1 - фаза 0, 0 - фаза pi), исследуемый вне эталонного
+    фрагмента - случайные биты.
+    """
+    def parameters(self, generator):
+        return generator.signal_freq, generator.bits_count
+
+    def mainlobe(self, generator):
+        # Символ кода занимает один интервал бита
+        return 1. / generator.bits_per_second
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        return np.array([[-1.], [1.]], dtype=complex)
+
+
+@register_modulation(ModulationType.MSEQUENCE)
+class MSequenceModulation(CodeModulation):
+    """
+    Фазовая манипуляция M-последовательностью.
+    """
+    def reference_code(self, generator, length: int):
+        return m_sequence(length)
+
+
+@register_modulation(ModulationType.GOLD)
+class GoldCodeModulation(CodeModulation):
+    """
+    Фазовая манипуляция кодом Голда.
+    """
+    def reference_code(self, generator, length: int):
+        return gold_code(length)
+
+
+@register_modulation(ModulationType.BARKER)
+class BarkerCodeModulation(CodeModulation):
+    """
+    Фазовая манипуляция кодом Баркера.
+    """
+    def mainlobe(self, generator):
+        # Элемент кода растянут на length / order интервалов бита
+        length = generator.bits_count + generator.bits_count % 2
+        return length / barker_order(length) / generator.bits_per_second
+
+    def reference_code(self, generator, length: int):
+        return barker_code(length)
+
+
+@register_modulation(ModulationType.FRANK)
+class FrankCodeModulation(CodeModulation):
+    """
+    Многофазная манипуляция кодом Фрэнка: M фаз 2*pi*k/M.
+    """
+    def reference_code(self, generator, length: int):
+        return frank_code(length)
+
+    def envelopes(self, generator, times: np.ndarray, params: dict):
+        order = frank_order(generator.bits_count + generator.bits_count % 2)
+        return np.exp(2j * np.pi * np.arange(order) / order)[:, np.newaxis]
+
+
+@register_modulation(ModulationType.LFM)
+class LinearFrequencyModulation(ModulationScheme):
+    """
+    Линейная частотная модуляция: частота эталонного сигнала линейно растёт
+    в полосе chirp_bandwidth за всю его длительность.
+
+    Состояние символа - номер бита внутри эталонного сигнала, поэтому фаза
+    вычисляется по номеру бита и времени от его начала, а не по шаблонам.
+    """
+    def parameters(self, generator):
+        return generator.signal_freq, generator.chirp_bandwidth, generator.bits_count
+
+    def bandwidth(self, generator):
+        return generator.chirp_bandwidth / 2. + generator.bits_per_second
+
+    def mainlobe(self, generator):
+        # Длительность сжатого импульса
+        return 1. / generator.chirp_bandwidth
+
+    def reference_code(self, generator, length: int):
+        return np.arange(length)
+
+    def templates(self, generator, times: np.ndarray, params: dict):
+        bit_time = params["bit_time"]
+        duration = (generator.bits_count + generator.bits_count % 2) * bit_time
+        # Фаза несущей, время от начала бита, скорость изменения частоты, длительность
+        carrier = np.zeros_like(times) if params["baseband"] else params["freq"] * times
+        return (carrier, times - np.floor(times / bit_time) * bit_time,
+                generator.chirp_bandwidth / duration, duration)
+
+    def modulate(self, templates: tuple, i_states: np.ndarray, q_states: np.ndarray, params: dict):
+        carrier, tau, rate, duration = templates
+        phase_i = np.pi * rate * (i_states * params["bit_time"] + tau - duration / 2.) ** 2
+        phase_q = np.pi * rate * (q_states * params["bit_time"] + tau - duration / 2.) ** 2
+        return combine_phases(carrier + phase_i, carrier + phase_q, params)
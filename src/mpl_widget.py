@@ -1,4 +1,5 @@
 from PyQt5 import QtWidgets
+import numpy as np
 
 from matplotlib import cm
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -111,7 +112,13 @@ class MplGraphics3dFunction(FigureCanvas):
     def plot_graph(self, x, y, z):
         """
         Построение графика функции модулированного сигнала.
+
+        :param x: Одномерный массив значений задержки.
+        :param y: Одномерный массив значений доплеровской частоты.
+        :param z: Матрица значений функции.
         """
+        # Сетка формируется только для отображения
+        x, y = np.meshgrid(x, y)
         self.ax.plot_surface(x, y, z, cmap=cm.coolwarm, linewidth=2)
 
     def clear_plot(self):
@@ -0,0 +1,106 @@
+import numpy as np
+
+from enums import NoiseType
+
+# Количество равномерно распределённых слагаемых в шуме прежнего генератора
+LEGACY_NOISE_TERMS = 20
+
+
+def _random(rng):
+    """
+    Генератор случайных чисел (по умолчанию - глобальный генератор NumPy).
+    """
+    return np.random if rng is None else rng
+
+
+def complex_white_noise(shape: tuple, rng=None):
+    """
+    Комплексный гауссовский белый шум единичной мощности.
+    """
+    rng = _random(rng)
+    return (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)) / np.sqrt(2.)
+
+
+def legacy_noise(shape: tuple, rng=None):
+    """
+    Шум прежнего генератора: среднее LEGACY_NOISE_TERMS равномерно
+    распределённых на [-1, 1] величин, отдельно для I и Q.
+    """
+    rng = _random(rng)
+    parts = rng.uniform(-1., 1., (2,) + tuple(shape) + (LEGACY_NOISE_TERMS,)).mean(axis=-1)
+    return parts[0] + 1j * parts[1]
+
+
+def colored_noise(shape: tuple, exponent: float, rng=None):
+    """
+    Окрашенный шум со спектральной плотностью мощности 1 / |f|^exponent
+    (1 - розовый, 2 - броуновский), полученный формирующим фильтром в
+    частотной области из белого шума.
+    """
+    white = complex_white_noise(shape, rng)
+    count = shape[-1]
+    freqs = np.abs(np.fft.fftfreq(count))
+    # Нулевая частота получает коэффициент ближайшей ненулевой
+    freqs[0] = 1. / count
+    gain = freqs ** (-exponent / 2.)
+    return np.fft.ifft(np.fft.fft(white, axis=-1) * gain, axis=-1)
+
+
+def impulsive_noise(shape: tuple, probability: float, ratio: float, rng=None):
+    """
+    Импульсный шум (модель Бернулли-Гаусса): белый шум, в котором с
+    вероятностью probability отсчёт заменяется импульсом с мощностью в ratio раз больше.
+    """
+    rng = _random(rng)
+    impulses = rng.random(shape) < probability
+    return complex_white_noise(shape, rng) * np.where(impulses, np.sqrt(ratio), 1.)
+
+
+def interference_noise(shape: tuple, times: np.ndarray, freq: float, ratio: float, rng=None):
+    """
+    Белый шум с гармонической помехой частоты freq со случайной фазой;
+    ratio - отношение мощности помехи к мощности белого шума.
+    """
+    rng = _random(rng)
+    phase = rng.uniform(0., 2. * np.pi, tuple(shape[:-1]) + (1,))
+    tone = np.sqrt(ratio) * np.exp(1j * (2. * np.pi * freq * np.asarray(times) + phase))
+    return complex_white_noise(shape, rng) + tone
+
+
+def _energy(values: np.ndarray):
+    return np.sum(np.abs(values) ** 2, axis=-1, keepdims=True)
+
+
+def add_noise(values, snr: float, noise_type: NoiseType, times=None, rng=None, **params):
+    """
+    Наложить шум на сигналы с заданным отношением сигнал/шум.
+
+    Шум формируется сразу для всех отсчётов (и, если values двумерный, для
+    всех сигналов пакета вдоль последней оси) и масштабируется так, чтобы
+    отношение энергий сигнала и шума каждой реализации было равно snr, дБ.
+    Для NoiseType.LEGACY, как и в прежнем генераторе, калибруются отдельно
+    синфазная и квадратурная составляющие.
+
+    :param params: Параметры модели шума: exponent (COLORED), probability и
+                   ratio (IMPULSIVE), freq и ratio (INTERFERENCE).
+    """
+    values = np.asarray(values)
+    shape = values.shape
+    if noise_type == NoiseType.LEGACY:
+        noise = legacy_noise(shape, rng)
+        scale = 10 ** (-snr / 20.)
+        real = noise.real * scale * np.sqrt(_energy(values.real) / _energy(noise.real))
+        imag = noise.imag * scale * np.sqrt(_energy(values.imag) / _energy(noise.imag))
+        return values + real + 1j * imag
+    elif noise_type == NoiseType.AWGN:
+        noise = complex_white_noise(shape, rng)
+    elif noise_type == NoiseType.COLORED:
+        noise = colored_noise(shape, params["exponent"], rng)
+    elif noise_type == NoiseType.IMPULSIVE:
+        noise = impulsive_noise(shape, params["probability"], params["ratio"], rng)
+    elif noise_type == NoiseType.INTERFERENCE:
+        noise = interference_noise(shape, times, params["freq"], params["ratio"], rng)
+    else:
+        raise ValueError(f"Неизвестный тип шума: {noise_type}")
+    alpha = np.sqrt(_energy(values) / (10 ** (snr / 10.)) / _energy(noise))
+    return values + alpha * noise
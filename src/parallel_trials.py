@@ -0,0 +1,94 @@
+import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from shared_arrays import share_array, SharedArrayRegistry
+from sweep import SWEEP_METRICS, run_trials
+
+# Количество испытаний, выполняемых процессом за одно задание
+DEFAULT_TRIALS_CHUNK = 25
+# Массивы результатов, передаваемые через разделяемую память
+SHARED_OUTPUTS = ("correlation", "fn3d")
+
+
+def _run_chunk(seed_key: str, params: dict, count: int, outputs: tuple):
+    """
+    Выполнить часть испытаний в процессе пула.
+
+    Корреляции всех испытаний и сумма матриц функции неопределенности
+    помещаются в разделяемую память, а процессу-координатору возвращаются
+    только их дескрипторы, суммы результатов и оси.
+    """
+    arrays = {}
+
+    def collect(generator):
+        if "correlation" in outputs:
+            if "correlation" not in arrays:
+                arrays["correlation"] = np.empty((count, len(generator.correlation[1])))
+                arrays["correlation_tao"] = np.asarray(generator.correlation[0])
+                arrays["trial"] = 0
+            arrays["correlation"][arrays["trial"]] = generator.correlation[1]
+            arrays["trial"] += 1
+        if "fn3d" in outputs:
+            if "fn3d" not in arrays:
+                arrays["fn3d"] = np.zeros(generator.fn3d.values.shape)
+                arrays["tao_list"] = generator.fn3d.tao_list
+                arrays["doppler_list"] = generator.fn3d.doppler_list
+            arrays["fn3d"] += generator.fn3d.values
+
+    sums = run_trials(seed_key, params, count, collect=collect)
+    return {"count": count,
+            "sums": sums,
+            "shared": {name: share_array(arrays.pop(name)) for name in outputs if name in arrays},
+            "axes": {name: value for name, value in arrays.items() if name != "trial"}}
+
+
+def run_parallel_trials(params: dict, trials: int, processes: int = None, chunk: int = DEFAULT_TRIALS_CHUNK,
+                        outputs: tuple = SHARED_OUTPUTS):
+    """
+    Параллельное выполнение испытаний SignalGenerator в одной точке параметров.
+
+    Большие массивы (корреляции, функции неопределенности) передаются между
+    процессами через разделяемую память и не сериализуются; блоки удаляются,
+    как только их содержимое перенесено в итоговые массивы.
+
+    :param outputs: Сохраняемые массивы: "correlation" - корреляции всех
+                    испытаний, "fn3d" - средняя функция неопределенности.
+    :return: Словарь: "average" - средние результаты испытаний и выбранные массивы с осями.
+    """
+    key = json.dumps({"params": params, "trials": trials}, sort_keys=True)
+    starts = list(range(0, trials, chunk))
+    result = {}
+    sums = dict.fromkeys(SWEEP_METRICS, 0.)
+    with SharedArrayRegistry() as registry, ProcessPoolExecutor(processes) as executor:
+        futures = {executor.submit(_run_chunk, f"{key}#{idx}", params, min(chunk, trials - start), outputs): start
+                   for idx, start in enumerate(starts)}
+        try:
+            for future in as_completed(futures):
+                start = futures.pop(future)
+                part = future.result()
+                for name in SWEEP_METRICS:
+                    sums[name] += part["sums"][name]
+                for name, value in part["axes"].items():
+                    result.setdefault(name, value)
+                for name, descriptor in part["shared"].items():
+                    with registry.view(descriptor) as values:
+                        if name == "correlation":
+                            if name not in result:
+                                result[name] = np.empty((trials, values.shape[1]))
+                            result[name][start:start + part["count"]] = values
+                        else:
+                            if name not in result:
+                                result[name] = np.zeros(values.shape)
+                            result[name] += values
+        finally:
+            # Блоки заданий, результаты которых не были обработаны из-за ошибки
+            for future in futures:
+                if not future.cancel() and future.exception() is None:
+                    for descriptor in future.result()["shared"].values():
+                        registry.acquire(descriptor)
+
+    if "fn3d" in result:
+        result["fn3d"] /= trials
+    result["average"] = {name: value / trials for name, value in sums.items()}
+    return result
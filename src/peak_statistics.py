@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def peak_statistics(values, mainlobe: int):
+    """
+    Статистики выраженности главного максимума корреляционных функций.
+
+    Вычисляются вдоль последней оси, поэтому values может содержать корреляции
+    многих испытаний сразу (размер (..., количество задержек)). Сумма и сумма
+    квадратов находятся за один проход, энергия главного лепестка - по
+    накопленной сумме квадратов.
+
+    :param values: Модули корреляционных функций.
+    :param mainlobe: Полуширина главного лепестка в отсчётах.
+    :return: Словарь массивов размером values.shape[:-1]:
+             peak_idx, peak_value - положение и значение главного максимума;
+             mean, std - среднее и среднеквадратичное отклонение;
+             criterion - отношение главного максимума к СКО;
+             pslr - отношение главного максимума к наибольшему боковому, дБ;
+             isl - интегральный уровень боковых лепестков, дБ.
+    """
+    values = np.asarray(values, dtype=float)
+    count = values.shape[-1]
+    peak_idx = np.argmax(values, axis=-1)[..., np.newaxis]
+    peak_value = np.take_along_axis(values, peak_idx, axis=-1)
+
+    squares = values ** 2
+    cumsum = np.zeros(values.shape[:-1] + (count + 1,))
+    np.cumsum(squares, axis=-1, out=cumsum[..., 1:])
+    energy = cumsum[..., -1:]
+    mean = values.sum(axis=-1, keepdims=True) / count
+    std = np.sqrt(np.maximum(energy / count - mean ** 2, 0.))
+
+    # Главный лепесток - отсчёты не дальше mainlobe от максимума
+    lo = np.clip(peak_idx - mainlobe, 0, count)
+    hi = np.clip(peak_idx + mainlobe + 1, 0, count)
+    mainlobe_energy = np.take_along_axis(cumsum, hi, axis=-1) - np.take_along_axis(cumsum, lo, axis=-1)
+    sidelobes = np.abs(np.arange(count) - peak_idx) > mainlobe
+    max_sidelobe = np.where(sidelobes, values, -np.inf).max(axis=-1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats = {"peak_idx": peak_idx,
+                 "peak_value": peak_value,
+                 "mean": mean,
+                 "std": std,
+                 "criterion": peak_value / std,
+                 "pslr": 20 * np.log10(peak_value / max_sidelobe),
+                 "isl": 10 * np.log10((energy - mainlobe_energy) / mainlobe_energy)}
+    return {name: value[..., 0] for name, value in stats.items()}
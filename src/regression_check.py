@@ -0,0 +1,230 @@
+import argparse
+import random
+import numpy as np
+
+from signals_generator import SignalGenerator
+from reference_generator import ReferenceSignalGenerator
+from stream_correlation import OverlapSaveCorrelator
+from enums import ModulationType, CorrelationMode, DelayModel
+
+# Типы модуляции, поддерживаемые эталонной реализацией
+REFERENCE_MOD_TYPES = (ModulationType.AM, ModulationType.FM, ModulationType.PM)
+
+# Допустимое относительное расхождение вещественных результатов
+DEFAULT_RTOL = 1e-6
+# Допустимое отклонение фактического ОСШ от заданного, дБ
+DEFAULT_SNR_TOL = 0.1
+# ОСШ и дробная временная задержка при проверке режимов расчёта
+MODES_SNR = 30.
+MODES_TIME_DELAY = 200.3
+# Количество потоков при проверке многопоточного вычисления функции неопределенности
+MODES_FFT_WORKERS = 4
+
+
+class RegressionReport:
+    """
+    Результаты сравнения оптимизированных стадий с эталонной реализацией.
+    """
+    def __init__(self):
+        self.checks = []
+
+    def add(self, case: str, name: str, ok: bool, detail: str = ""):
+        """
+        Добавить результат проверки.
+        """
+        self.checks.append({"case": case, "name": name, "ok": bool(ok), "detail": detail})
+
+    def close(self, case: str, name: str, actual, expected, rtol: float):
+        """
+        Проверить совпадение массивов с относительной точностью rtol.
+        """
+        actual, expected = np.asarray(actual), np.asarray(expected)
+        if actual.shape != expected.shape:
+            self.add(case, name, False, f"размер {actual.shape} != {expected.shape}")
+            return
+        scale = max(np.max(np.abs(expected)), 1e-300) if expected.size else 1.
+        error = np.max(np.abs(actual - expected)) / scale if expected.size else 0.
+        self.add(case, name, error <= rtol, f"отн. погрешность {error:.2e}")
+
+    def equal(self, case: str, name: str, actual, expected):
+        """
+        Проверить точное совпадение значений.
+        """
+        self.add(case, name, np.array_equal(np.asarray(actual), np.asarray(expected)), f"{actual} / {expected}")
+
+    @property
+    def failed(self):
+        return [check for check in self.checks if not check["ok"]]
+
+
+def seed_all(seed: int):
+    """
+    Зафиксировать генераторы случайных чисел.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def check_case(report: RegressionReport, mod_type: ModulationType, seed: int, rtol: float, snr_tol: float):
+    """
+    Сравнить стадии SignalGenerator с эталонной реализацией для одного типа модуляции.
+
+    Чтобы сравнение не зависело от генераторов случайных чисел, оптимизированные
+    стадии получают те же входные данные, что и эталонные.
+    """
+    case = f"{mod_type.name}, seed={seed}"
+    seed_all(seed)
+    oracle = ReferenceSignalGenerator()
+    fast = SignalGenerator()
+
+    # Информационные биты и I/Q компоненты
+    oracle._generate_info_bits()
+    fast.reference_bits, fast.research_bits = list(oracle.reference_bits), list(oracle.research_bits)
+    oracle.reference_i, oracle.reference_q = oracle._get_components(list(oracle.reference_bits))
+    oracle.research_i, oracle.research_q = oracle._get_components(list(oracle.research_bits))
+    fast.reference_i, fast.reference_q = fast._get_components(fast.reference_bits)
+    fast.research_i, fast.research_q = fast._get_components(fast.research_bits)
+    for name in ("reference_i", "reference_q", "research_i", "research_q"):
+        report.equal(case, name, getattr(fast, name), getattr(oracle, name))
+
+    # Модуляция
+    clean = {}
+    for name, bits in (("reference_mod", oracle.reference_i), ("research_mod", oracle.research_i)):
+        expected = oracle._calc_modulation(mod_type, oracle._get_signal_parameters(len(bits)))
+        actual = fast._calc_modulation(mod_type, fast._get_signal_parameters(len(bits)))
+        report.close(case, f"{name} (время)", actual[0], expected[0], rtol)
+        report.close(case, f"{name} (отсчёты)", actual[1], expected[1], rtol)
+        clean[name] = expected
+
+    # Шум: проверяется калибровка ОСШ
+    for name, signal in clean.items():
+        noisy = np.asarray(fast._get_noise_parts(signal)[1])
+        clean_values = np.asarray(signal[1])
+        signal_energy = np.sum(np.abs(clean_values) ** 2)
+        noise_energy = np.sum(np.abs(noisy - clean_values) ** 2)
+        snr = 10 * np.log10(signal_energy / noise_energy)
+        report.add(case, f"{name} (ОСШ)", abs(snr - fast.snr) <= snr_tol, f"{snr:.3f} дБ")
+
+    # Корреляция, критерий и функция неопределенности на одинаковых зашумленных сигналах
+    oracle.reference_mod = oracle._get_noise_parts(clean["reference_mod"])
+    oracle.research_mod = oracle._get_noise_parts(clean["research_mod"])
+    oracle.correlation = oracle._get_correlation()
+    oracle.found_time_delay = oracle._find_correlation_max()
+    oracle.criterion = oracle._calc_criterion()
+    oracle.fn3d = oracle._calc_3d_function()
+    oracle._calc_2d_function()
+
+    fast.reference_mod = [list(oracle.reference_mod[0]), list(oracle.reference_mod[1])]
+    fast.research_mod = [list(oracle.research_mod[0]), list(oracle.research_mod[1])]
+    fast._process_signals()
+
+    report.close(case, "correlation", fast.correlation[1], oracle.correlation[1], rtol)
+    report.equal(case, "found_time_delay", fast.found_time_delay, oracle.found_time_delay)
+    correlator = OverlapSaveCorrelator(np.array(oracle.reference_mod[1]), len(oracle.reference_mod[1]))
+    stream_correlation = correlator.process(np.array(oracle.research_mod[1]))
+    report.close(case, "correlation (overlap-save)", stream_correlation / stream_correlation.max(),
+                 oracle.correlation[1], rtol)
+    report.close(case, "criterion", fast.criterion, oracle.criterion, rtol)
+    # Эталонная матрица упорядочивается по возрастанию доплеровской частоты
+    order = np.argsort(oracle.fn3d[1][:, 0], kind="stable")
+    expected_fn3d = oracle.fn3d[2][order]
+    report.close(case, "fn3d", fast.fn3d.values, expected_fn3d, rtol)
+    report.close(case, "fn3d (задержки)", fast.fn3d.tao_list, oracle.tao_list, rtol)
+    report.close(case, "fn3d (частоты)", fast.fn3d.doppler_list, np.asarray(oracle.doppler_list)[order], rtol)
+    report.close(case, "found_time_delay_f", fast.found_time_delay_f, oracle.found_time_delay_f, rtol)
+    report.equal(case, "found_doppler", fast.found_doppler, oracle.found_doppler)
+
+
+def check_modes(report: RegressionReport, mod_type: ModulationType, seed: int):
+    """
+    Проверить согласованность режимов расчёта, для которых нет эталонной
+    реализации: многопоточного БПФ, прореживания, банка корреляторов,
+    комплексной огибающей и дробной задержки.
+
+    Режимы обработки сравниваются на одних и тех же сигналах с
+    последовательным расчётом без прореживания, режимы формирования сигналов -
+    с заданной задержкой (с точностью до шага задержки).
+    """
+    case = f"{mod_type.name}, seed={seed}, режимы"
+    seed_all(seed)
+    generator = SignalGenerator(snr=MODES_SNR)
+    generator.calculate(mod_type)
+    step = (generator.reference_mod[0][1] - generator.reference_mod[0][0]) * 1000
+    serial_fn3d = np.array(generator.fn3d.values)
+    serial = {name: getattr(generator, name) for name in ("found_time_delay", "found_time_delay_f", "found_doppler")}
+
+    def near(name: str, actual: float, expected: float, tolerance: float):
+        report.add(case, name, abs(actual - expected) <= tolerance, f"{actual:g} / {expected:g} (допуск {tolerance:g})")
+
+    # Многопоточное БПФ функции неопределенности совпадает с последовательным
+    generator.fft_workers = MODES_FFT_WORKERS
+    generator._process_signals()
+    report.close(case, f"fn3d (fft_workers={MODES_FFT_WORKERS})", generator.fn3d.values, serial_fn3d, 0.)
+    for name, value in serial.items():
+        report.equal(case, f"{name} (fft_workers={MODES_FFT_WORKERS})", getattr(generator, name), value)
+    generator.fft_workers = 1
+
+    # Автоматическое прореживание: оценка с точностью до шага задержки после прореживания
+    # (максимум функции неопределенности АМ-сигнала неустойчив и не сравнивается)
+    generator.decimation = None
+    generator._process_signals()
+    factor = generator.get_decimation_factor()
+    near(f"found_time_delay (прореживание {factor})", generator.found_time_delay, serial["found_time_delay"],
+         factor * step)
+    generator.decimation = 1
+
+    # Банк корреляторов: та же задержка, доплеровское смещение - с точностью до разрешения
+    generator.correlation_mode = CorrelationMode.DOPPLER_BANK
+    generator._process_signals()
+    near("found_time_delay (банк корреляторов)", generator.found_time_delay, serial["found_time_delay"], step)
+    resolution = 1. / (generator.reference_mod[0][-1] + step / 1000)
+    near("found_doppler_bank", generator.found_doppler_bank, generator.doppler_effect, resolution / 2)
+    generator.correlation_mode = CorrelationMode.DIRECT
+
+    # Комплексная огибающая и дробная задержка: оценка совпадает с заданной задержкой
+    # (дробная задержка - без доплеровского смещения, сжатие времени сдвигает максимум)
+    for name, options in (("комплексная огибающая", {"baseband": True}),
+                          ("дробная задержка", {"delay_model": DelayModel.FRACTIONAL,
+                                                "time_delay": MODES_TIME_DELAY,
+                                                "doppler_effect": 0.})):
+        seed_all(seed)
+        generator = SignalGenerator(snr=MODES_SNR)
+        for option, value in options.items():
+            setattr(generator, option, value)
+        generator.calculate(mod_type)
+        near(f"found_time_delay ({name})", generator.found_time_delay, generator.time_delay, step)
+
+
+def run_regression(seeds: list, rtol: float = DEFAULT_RTOL, snr_tol: float = DEFAULT_SNR_TOL,
+                   mod_types: list = None):
+    """
+    Выполнить сравнение для всех типов модуляции и заданных начальных значений.
+    """
+    report = RegressionReport()
+    for mod_type in mod_types or REFERENCE_MOD_TYPES:
+        for seed in seeds:
+            check_case(report, mod_type, seed, rtol, snr_tol)
+            check_modes(report, mod_type, seed)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение оптимизированных стадий с эталонной реализацией")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--rtol", type=float, default=DEFAULT_RTOL)
+    parser.add_argument("--snr-tol", type=float, default=DEFAULT_SNR_TOL)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    report = run_regression(args.seeds, args.rtol, args.snr_tol)
+    for check in report.checks:
+        if args.verbose or not check["ok"]:
+            status = "OK  " if check["ok"] else "FAIL"
+            print(f"{status} [{check['case']}] {check['name']}: {check['detail']}")
+    print(f"Проверок: {len(report.checks)}, ошибок: {len(report.failed)}")
+    if report.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
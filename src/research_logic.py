@@ -1,20 +1,32 @@
+import os
 import numpy as np
 
+from array_storage import open_array, load_array, tiled_mean, iter_tiles
+from peak_statistics import peak_statistics
 from signals_generator import SignalGenerator
 from enums import ModulationType
 
-MOD_TYPE = ModulationType.FM
-
 
 def calc_research_bad_alg(average_count: int, signal_generator: SignalGenerator,
-                          from_doppler: float = 0., to_doppler: float = 3., step_doppler: float = 0.01):
+                          from_doppler: float = 0., to_doppler: float = 3., step_doppler: float = 0.01,
+                          storage_dir: str = None, store_correlations: bool = False,
+                          mod_type: ModulationType = ModulationType.FM):
     """
     Исследование устойчивости алгоритма оценки взаимной временной задержки
     сигналов на основе метода максимального правдоподобия в зависимости от
     доплеровского смещения.
+
+    При заданном storage_dir критерии каждого испытания (и, при store_correlations,
+    корреляционные функции) записываются в файлы .npy, отображаемые в память.
     """
+    dopplers = np.arange(from_doppler, to_doppler, step_doppler)
+    criterions, correlations = None, None
+    if storage_dir is not None:
+        criterions = open_array(os.path.join(storage_dir, "criterion.npy"), (dopplers.size, average_count))
+        np.save(os.path.join(storage_dir, "doppler.npy"), dopplers)
+
     x, y = [], []
-    for dpl in np.arange(from_doppler, to_doppler, step_doppler):
+    for dpl_idx, dpl in enumerate(dopplers):
         print(f"Запускается расчет исследования при {dpl} Гц...")
         # Обновление доплеровского смещения
         signal_generator.doppler_effect = dpl
@@ -23,10 +35,53 @@ def calc_research_bad_alg(average_count: int, signal_generator: SignalGenerator,
         # Цикл для усреднений
         for avg in range(average_count):
             # Вычисление задержки
-            signal_generator.calculate(MOD_TYPE)
+            signal_generator.calculate(mod_type)
             avg_criterion += signal_generator.criterion
+            # Сохранение результатов испытания
+            if criterions is not None:
+                criterions[dpl_idx, avg] = signal_generator.criterion
+                if store_correlations:
+                    if correlations is None:
+                        correlations = open_array(os.path.join(storage_dir, "correlation.npy"),
+                                                  (dopplers.size, average_count,
+                                                   len(signal_generator.correlation[1])))
+                    correlations[dpl_idx, avg] = signal_generator.correlation[1]
         # Усредненный критерий
         avg_criterion /= average_count
         x.append(dpl)
         y.append(avg_criterion)
+
+    if criterions is not None:
+        criterions.flush()
+    if correlations is not None:
+        correlations.flush()
     return [x, y]
+
+
+def load_research_bad_alg(storage_dir: str, tile: int = 64):
+    """
+    Получить зависимость усредненного критерия от доплеровского смещения
+    по сохранённым результатам исследования без их повторного расчёта.
+    """
+    dopplers = np.load(os.path.join(storage_dir, "doppler.npy"))
+    criterions = load_array(os.path.join(storage_dir, "criterion.npy"))
+    return [dopplers.tolist(), tiled_mean(criterions, tile).tolist()]
+
+
+def load_research_statistics(storage_dir: str, mainlobe: int, tile: int = 64):
+    """
+    Вычислить статистики главного максимума (критерий, PSLR, ISL и др.) для всех
+    сохранённых корреляционных функций исследования.
+
+    Корреляции обрабатываются пакетами по tile значений доплеровского смещения.
+
+    :return: Словарь массивов размером (количество смещений, количество испытаний).
+    """
+    correlations = load_array(os.path.join(storage_dir, "correlation.npy"))
+    stats = {}
+    for start, stop in iter_tiles(correlations.shape[0], tile):
+        for name, value in peak_statistics(correlations[start:stop], mainlobe).items():
+            if name not in stats:
+                stats[name] = np.empty(correlations.shape[:2], dtype=value.dtype)
+            stats[name][start:stop] = value
+    return stats
@@ -0,0 +1,149 @@
+import json
+import numpy as np
+from enum import Enum
+
+from array_storage import iter_tiles
+from defaults import DEFAULT_TILE_SIZE
+from enums import ModulationType, CorrelationMode
+
+# Версия формата файла результатов
+RESULTS_FORMAT_VERSION = 1
+
+# Параметры обработки, сохраняемые в метаданных
+PARAMETER_NAMES = ("sampling_rate", "bits_per_second", "correlation_mode", "decimation")
+
+# Параметры формирования сигналов, сохраняемые только для сгенерированных (не записанных) сигналов
+SIGNAL_PARAMETER_NAMES = ("signal_freq", "bits_count", "time_delay", "snr", "doppler_effect",
+                          "delay_model", "baseband", "noise_type", "noise_exponent", "impulse_probability",
+                          "impulse_ratio", "interference_freq", "interference_ratio")
+
+# Результаты расчёта, сохраняемые в метаданных
+RESULT_NAMES = ("found_time_delay", "criterion", "found_time_delay_f", "found_doppler")
+
+
+def _metadata_value(value):
+    """
+    Привести значение параметра к виду, сохраняемому в JSON (перечисления - по имени).
+    """
+    if isinstance(value, Enum):
+        return value.name
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def export_results(path: str, signal_generator, research: list = None, chunk: int = DEFAULT_TILE_SIZE,
+                   mod_type: ModulationType = None):
+    """
+    Сохранить сигналы, корреляцию, функцию неопределенности, её сечения и
+    график исследования в сжатый файл .npz вместе с параметрами расчёта.
+
+    Матрица функции неопределенности разбивается на блоки по chunk отсчётов
+    задержки, чтобы при чтении можно было загрузить только нужный диапазон.
+
+    :param mod_type: Тип модуляции (по умолчанию - тип последнего расчёта генератора,
+                     None - записанные сигналы).
+    """
+    if mod_type is None:
+        mod_type = signal_generator.mod_type
+    arrays = {}
+    parameters = {name: _metadata_value(getattr(signal_generator, name)) for name in PARAMETER_NAMES}
+    parameters["mod_type"] = _metadata_value(mod_type)
+    # Для записанных сигналов (mod_type is None) параметры формирования не имеют смысла
+    if mod_type is not None:
+        parameters.update({name: _metadata_value(getattr(signal_generator, name))
+                           for name in SIGNAL_PARAMETER_NAMES})
+    # Фактический коэффициент прореживания (в том числе выбранный автоматически)
+    parameters["decimation_factor"] = signal_generator.get_decimation_factor()
+    metadata = {"version": RESULTS_FORMAT_VERSION,
+                "parameters": parameters,
+                "results": {name: float(getattr(signal_generator, name)) for name in RESULT_NAMES}}
+
+    # Сигналы и корреляция
+    for name in ("reference_mod", "research_mod", "correlation"):
+        signal = getattr(signal_generator, name)
+        if len(signal):
+            arrays[f"{name}_x"] = np.asarray(signal[0])
+            arrays[f"{name}_y"] = np.asarray(signal[1])
+
+    # Банк корреляторов: гипотезы доплеровского смещения, максимумы для них и оценка
+    if signal_generator.correlation_mode == CorrelationMode.DOPPLER_BANK and len(signal_generator.doppler_bank_peaks):
+        arrays["doppler_bank"] = np.asarray(signal_generator.doppler_bank)
+        arrays["doppler_bank_peaks"] = np.asarray(signal_generator.doppler_bank_peaks)
+        metadata["results"]["found_doppler_bank"] = float(signal_generator.found_doppler_bank)
+
+    # Функция неопределенности и её сечения
+    fn3d = signal_generator.fn3d
+    if fn3d is not None:
+        arrays["fn3d_tao"] = fn3d.tao_list
+        arrays["fn3d_doppler"] = fn3d.doppler_list
+        arrays["fn2d_tao"] = fn3d.fn2d_tao
+        arrays["fn2d_doppler"] = fn3d.fn2d_doppler
+        chunks = []
+        for idx, (start, stop) in enumerate(iter_tiles(fn3d.tao_list.size, chunk)):
+            arrays[f"fn3d_values_{idx:05d}"] = np.asarray(fn3d.values[:, start:stop])
+            chunks.append([start, stop])
+        metadata["fn3d_chunks"] = chunks
+
+    # График исследования
+    if research is not None:
+        arrays["research_x"] = np.asarray(research[0])
+        arrays["research_y"] = np.asarray(research[1])
+
+    arrays["metadata"] = np.array(json.dumps(metadata))
+    np.savez_compressed(path, **arrays)
+
+
+class ResultsFile:
+    """
+    Файл сохранённых результатов.
+
+    Массивы читаются из файла только при обращении к ним.
+    """
+    def __init__(self, path: str):
+        self.archive = np.load(path, allow_pickle=False)
+        self.metadata = json.loads(str(self.archive["metadata"]))
+        if self.metadata["version"] != RESULTS_FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла результатов: {self.metadata['version']}")
+
+    def __contains__(self, name: str):
+        return name in self.archive.files
+
+    def read(self, name: str):
+        """
+        Прочитать сохранённый массив по имени.
+        """
+        return self.archive[name]
+
+    def read_signal(self, name: str):
+        """
+        Прочитать сигнал в формате [x, y].
+        """
+        return [self.archive[f"{name}_x"], self.archive[f"{name}_y"]]
+
+    def read_fn3d(self, from_idx: int = 0, to_idx: int = None):
+        """
+        Прочитать столбцы функции неопределенности для отсчётов задержки [from_idx, to_idx).
+
+        Загружаются только блоки, пересекающиеся с диапазоном.
+        """
+        chunks = self.metadata["fn3d_chunks"]
+        if to_idx is None:
+            to_idx = chunks[-1][1]
+        parts = []
+        for idx, (start, stop) in enumerate(chunks):
+            if stop <= from_idx or start >= to_idx:
+                continue
+            block = self.archive[f"fn3d_values_{idx:05d}"]
+            parts.append(block[:, max(from_idx - start, 0):min(to_idx, stop) - start])
+        return np.concatenate(parts, axis=1)
+
+    def close(self):
+        """
+        Закрыть файл.
+        """
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
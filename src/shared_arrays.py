@@ -0,0 +1,91 @@
+import contextlib
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+
+def share_array(values: np.ndarray):
+    """
+    Скопировать массив в новый блок разделяемой памяти.
+
+    Блок не удаляется при завершении создавшего его процесса: владельцем
+    становится получатель дескриптора (см. SharedArrayRegistry).
+
+    :return: Дескриптор блока (имя, размер и тип массива).
+    """
+    values = np.ascontiguousarray(values)
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, values.dtype, buffer=block.buf)[...] = values
+    resource_tracker.unregister(block._name, "shared_memory")
+    block.close()
+    return {"name": block.name, "shape": tuple(values.shape), "dtype": values.dtype.str}
+
+
+class SharedArrayRegistry:
+    """
+    Подсчёт ссылок на блоки разделяемой памяти, полученные по дескрипторам.
+
+    Блок подключается при первом acquire и удаляется, когда release
+    вызван столько же раз. Массивы, полученные из блока, остаются
+    корректными и после удаления (память освобождается вместе с последним
+    из них), но новые подключения по имени блока становятся невозможны.
+    """
+    def __init__(self):
+        # Имя блока -> [блок, количество ссылок]
+        self.blocks = {}
+
+    def acquire(self, descriptor: dict):
+        """
+        Получить массив из блока по дескриптору и увеличить счётчик ссылок.
+        """
+        name = descriptor["name"]
+        if name not in self.blocks:
+            self.blocks[name] = [shared_memory.SharedMemory(name=name), 0]
+        self.blocks[name][1] += 1
+        block = self.blocks[name][0]
+        return np.ndarray(descriptor["shape"], np.dtype(descriptor["dtype"]), buffer=block.buf)
+
+    def release(self, descriptor: dict):
+        """
+        Уменьшить счётчик ссылок и удалить блок, если ссылок не осталось.
+        """
+        name = descriptor["name"]
+        self.blocks[name][1] -= 1
+        if self.blocks[name][1] <= 0:
+            self._remove(name)
+
+    @contextlib.contextmanager
+    def view(self, descriptor: dict):
+        """
+        Массив из блока на время контекста.
+        """
+        values = self.acquire(descriptor)
+        try:
+            yield values
+        finally:
+            del values
+            self.release(descriptor)
+
+    def _remove(self, name: str):
+        block, _ = self.blocks.pop(name)
+        block.unlink()
+        try:
+            block.close()
+        except BufferError:
+            # На блок ещё ссылаются массивы - память освободится вместе с ними
+            pass
+
+    def close(self):
+        """
+        Удалить все блоки независимо от количества ссылок.
+        """
+        for name in list(self.blocks):
+            self._remove(name)
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,7 +1,18 @@
-import random
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+from ambiguity_function import AmbiguityFunction
+from array_storage import iter_tiles
 from defaults import *
+from decimation import decimate, decimation_factor
+from detection import cfar_detect
+from fractional_delay import resample_at
+from iq_loader import SampleTimes
+from modulations import get_modulation
+from noise import add_noise
+from peak_statistics import peak_statistics
+from stream_correlation import OverlapSaveCorrelator, matched_filter, doppler_bank_correlation
 from enums import *
 
 
@@ -18,16 +29,25 @@ class SignalGenerator:
         self.signal_freq = float(s_freq)
         self.bits_count = int(b_count)
         self.bits_per_second = float(bps)
-        self.time_delay = int(t_delay)
+        self.time_delay = float(t_delay)
         self.snr = float(snr)
         self.doppler_effect = float(e_doppler)
         self.signal_phase = 0.
+        # Способ задержки эталонного сигнала: вставка с точностью до бита или
+        # дробная задержка с масштабированием времени по доплеровскому смещению
+        self.delay_model = DelayModel.BIT
         self.found_time_delay = 0
 
         # Буферы для хранения информационных бит
         self.reference_bits = []
         self.research_bits = []
 
+        # Кэш номеров битов для временных отсчётов сигналов и шаблонов символов
+        self._bit_indices_cache = {}
+        self._templates_cache = {}
+        # Кэш номеров битов-источников исследуемого сигнала (со вставкой эталонного)
+        self._source_indices_cache = {}
+
         # Буферы для хранения I и Q компонент
         self.reference_i = []
         self.reference_q = []
@@ -43,9 +63,34 @@ class SignalGenerator:
 
         # Буфер для хранения критерия выраженности главного максимума
         self.criterion = 0
+        # Статистики выраженности главного максимума (PSLR, ISL и др.)
+        self.correlation_stats = {}
 
         # Буфер для хранения взаимной функции неопределенности
-        self.fn3d = []
+        self.fn3d = None
+        # Путь к файлу для хранения матрицы функции неопределенности (None - в памяти)
+        self.fn3d_path = None
+        # Количество отсчётов задержки, обрабатываемых за один блок
+        self.tile_size = DEFAULT_TILE_SIZE
+        # Прореживание сигналов перед корреляцией (1 - нет, None - автоматический выбор)
+        self.decimation = DEFAULT_DECIMATION
+        # Прореженные сигналы: (исходные эталонный и исследуемый, коэффициент, результат)
+        self._decimated = None
+        # Модель шума и её параметры
+        self.noise_type = NoiseType.LEGACY
+        self.noise_exponent = DEFAULT_NOISE_EXPONENT
+        self.impulse_probability = DEFAULT_IMPULSE_PROBABILITY
+        self.impulse_ratio = DEFAULT_IMPULSE_RATIO
+        self.interference_freq = DEFAULT_INTERFERENCE_FREQ
+        self.interference_ratio = DEFAULT_INTERFERENCE_RATIO
+        # Формирование комплексной огибающей вместо сигнала на несущей
+        self.baseband = False
+        # Перенос комплексной огибающей на несущую при отображении
+        self.upconvert_display = True
+        # Тип модуляции последнего расчёта (None - записанные сигналы)
+        self.mod_type = None
+        # Количество потоков для БПФ функции неопределенности
+        self.fft_workers = DEFAULT_FFT_WORKERS
         self.tao_list = []
         self.doppler_list = []
         self.fn2d_tao = []
@@ -53,6 +98,27 @@ class SignalGenerator:
         self.found_time_delay_f = 0
         self.found_doppler = 0
 
+        # Способ вычисления корреляции и гипотезы доплеровского смещения для банка корреляторов
+        self.correlation_mode = CorrelationMode.DIRECT
+        self.doppler_bank = np.arange(-DEFAULT_DOPPLER_BANK_MAX,
+                                      DEFAULT_DOPPLER_BANK_MAX + DEFAULT_DOPPLER_BANK_STEP / 2,
+                                      DEFAULT_DOPPLER_BANK_STEP)
+        # Результаты банка корреляторов
+        self.doppler_bank_peaks = []
+        self.found_doppler_bank = 0
+
+        # Обнаружение пиков CFAR (None - отключено)
+        self.cfar_type = None
+        self.cfar_guard = DEFAULT_CFAR_GUARD
+        self.cfar_train = DEFAULT_CFAR_TRAIN
+        self.cfar_threshold = DEFAULT_CFAR_THRESHOLD
+        # Обнаруженные пики корреляционной функции и функции неопределенности
+        self.correlation_peaks = []
+        self.fn3d_peaks = []
+
+        # Профилирование стадий расчёта (None - отключено)
+        self.profiler = None
+
         # Параметры АМ
         self.low_ampl = 1.
         self.high_ampl = 8.
@@ -60,34 +126,47 @@ class SignalGenerator:
         # Параметры ФМ
         self.mod_index = 2
 
+        # Полоса девиации ЛЧМ-сигнала, Гц
+        self.chirp_bandwidth = 100.
+        # Произведение полосы на длительность бита для манипуляции направлением ЛЧМ
+        self.chirp_bt = DEFAULT_CHIRP_BT
+
     @staticmethod
     def _generate_bits(bits_count):
         """
         Формирование случайной битовой информационной последовательности.
+
+        Случайными генерируются упакованные байты (по 8 бит), которые затем
+        распаковываются в массив uint8 из нулей и единиц.
         """
-        bits = []
-        for i in range(int(bits_count)):
-            x = random.randint(0, 1)
-            bits.append(x)
-        return bits
+        bits_count = int(bits_count)
+        packed = np.random.randint(0, 256, (bits_count + 7) // 8, dtype=np.uint8)
+        return np.unpackbits(packed)[:bits_count]
 
     @staticmethod
-    def _get_components(bits: list):
+    def _get_components(bits: np.ndarray):
         """
         Получить I и Q компоненты.
+
+        Чётные биты образуют I, нечётные - Q компоненту; каждый бит повторяется
+        дважды. При нечётном количестве битов добавляется нулевой бит
+        (исходный массив не изменяется).
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.size % 2 != 0:
+            bits = np.append(bits, np.uint8(0))
+        return np.repeat(bits[0::2], 2), np.repeat(bits[1::2], 2)
+
+    def _get_reference_components(self, mod_type: ModulationType):
         """
-        if len(bits) % 2 != 0:
-            bits.append(0)
-
-        i_component = []
-        q_component = []
-        for i in range(len(bits)):
-            if i % 2 == 0:
-                i_component.append(bits[i])
-                i_component.append(bits[i])
-            else:
-                q_component.append(bits[i])
-                q_component.append(bits[i])
+        Получить I и Q компоненты эталонного сигнала.
+
+        Для кодовых сигналов обе компоненты содержат код схемы модуляции.
+        """
+        i_component, q_component = self._get_components(self.reference_bits)
+        code = get_modulation(mod_type).reference_code(self, i_component.size)
+        if code is not None:
+            return code, code
         return i_component, q_component
 
     def _generate_info_bits(self):
@@ -119,289 +198,512 @@ class SignalGenerator:
                   "signal_duration": signal_duration,
                   "freq": w,
                   "timestep": timestep,
-                  "signal_type": signal_type}
+                  "signal_type": signal_type,
+                  "baseband": self.baseband}
         return params
 
-    def _calc_modulation(self, mod_type: ModulationType, params: dict):
+    def _calc_modulation(self, mod_type: ModulationType, params: dict,
+                         first_sample: int = 0, samples_count: int = None, first_bit: int = 0,
+                         insert_reference: bool = True):
         """
-        Построить фазово-манипулированный сигнал.
+        Построить модулированный сигнал.
+
+        При заданном samples_count строится только фрагмент сигнала, начиная с
+        отсчёта first_sample; буферы битов при этом содержат биты, начиная с first_bit.
+        При insert_reference=False исследуемый сигнал строится без вставки эталонного.
         """
-        # Получение параметров сигнала
-        x, y = [], []
+        scheme = get_modulation(mod_type)
         # Временная задержка, сек
         td_sec = self.time_delay / 1000
         # Индекс массива при начале вставки
-        add_idx = int(td_sec / params["bit_time"])
-        for t in np.arange(0, params["signal_duration"], params["timestep"]):
-            # Получение текущего бита
-            bit_index = int(t / params["bit_time"])
-            # Получение отсчета модуляции
-            value = 0
-            if mod_type == ModulationType.PM:
-                value = self._calc_phase_value(params, bit_index, add_idx, t, td_sec)
-            elif mod_type == ModulationType.AM:
-                value = self._calc_ampl_value(params, bit_index, add_idx, t, td_sec)
-            elif mod_type == ModulationType.FM:
-                value = self._calc_freq_value(params, bit_index, add_idx, t, td_sec)
-
-            # Добавление эффекта доплера
-            if params["signal_type"] == SignalType.RESEARCH:
-                # Добавление доплеровского сдвига
-                arg = self.doppler_effect * t * 2. * np.pi
-                value *= complex(np.cos(arg), np.sin(arg))
-
-            x.append(t)
-            y.append(value)
-
-        return [x, y]
+        add_idx = int(td_sec / params["bit_time"]) - first_bit
+        # Временные отсчёты и номера соответствующих им битов
+        times, bit_indices = self._get_sample_bit_indices(params, first_sample, samples_count)
+        bit_indices = bit_indices - first_bit
 
-    def _calc_freq_value(self, params: dict, bit_index: int, add_idx: int, t: float, td_sec: float):
-        """
-        Сгенерировать временной отсчет амплитудной модуляции.
-        """
-        freq_i = 0
-        freq_q = 0
-        low_freq = self.signal_freq
-        high_freq = self.signal_freq * self.mod_index
-        if params["signal_type"] == SignalType.REFERENCE:
-            # Обработка амплитудной модуляции
-            freq_i = low_freq if self.reference_i[bit_index] == 0 else high_freq
-            freq_q = low_freq if self.reference_q[bit_index] == 0 else high_freq
-        elif params["signal_type"] == SignalType.RESEARCH:
-            # Вставка эталонного сигнала
-            if t >= td_sec and (bit_index - add_idx) < len(self.reference_i):
-                freq_i = low_freq if self.reference_i[bit_index - add_idx] == 0 else high_freq
-                freq_q = low_freq if self.reference_q[bit_index - add_idx] == 0 else high_freq
-            else:
-                freq_i = low_freq if self.research_i[bit_index] == 0 else high_freq
-                freq_q = low_freq if self.research_q[bit_index] == 0 else high_freq
-
-        # Заполнение списка отсчетов\значений
-        value = complex(np.cos(2. * np.pi * freq_i * t), np.cos(2. * np.pi * freq_q * t))
-        return value
-
-    def _calc_ampl_value(self, params: dict, bit_index: int, add_idx: int, t: float, td_sec: float):
-        """
-        Сгенерировать временной отсчет амплитудной модуляции.
-        """
-        ampl_i = 0
-        ampl_q = 0
+        # Состояния символов в каждом отсчёте
+        reference_i, reference_q = scheme.symbols(self.reference_i), scheme.symbols(self.reference_q)
         if params["signal_type"] == SignalType.REFERENCE:
-            # Обработка амплитудной модуляции
-            ampl_i = self.low_ampl if self.reference_i[bit_index] == 0 else self.high_ampl
-            ampl_q = self.low_ampl if self.reference_q[bit_index] == 0 else self.high_ampl
-        elif params["signal_type"] == SignalType.RESEARCH:
-            # Вставка эталонного сигнала
-            if t >= td_sec and (bit_index - add_idx) < len(self.reference_i):
-                ampl_i = self.low_ampl if self.reference_i[bit_index - add_idx] == 0 else self.high_ampl
-                ampl_q = self.low_ampl if self.reference_q[bit_index - add_idx] == 0 else self.high_ampl
-            else:
-                ampl_i = self.low_ampl if self.research_i[bit_index] == 0 else self.high_ampl
-                ampl_q = self.low_ampl if self.research_q[bit_index] == 0 else self.high_ampl
-
-        # Заполнение списка отсчетов\значений
-        value = complex(ampl_i * np.cos(params["freq"] * t), ampl_q * np.cos(params["freq"] * t))
-        return value
-
-    def _calc_phase_value(self, params: dict, bit_index: int, add_idx: int, t: float, td_sec: float):
-        """
-        Сгенерировать временной отсчет фазовой модуляции.
-        """
-        ph_i = 0
-        ph_q = 0
-        if params["signal_type"] == SignalType.REFERENCE:
-            # Обработка фазовой манипуляции
-            ph_i = (3. * np.pi) / 4. if self.reference_i[bit_index] == 0 else (7. * np.pi) / 4.
-            ph_q = (3. * np.pi) / 4. if self.reference_q[bit_index] == 0 else (7. * np.pi) / 4.
-        elif params["signal_type"] == SignalType.RESEARCH:
-            # Вставка эталонного сигнала
-            if t >= td_sec and (bit_index - add_idx) < len(self.reference_i):
-                # Обработка фазовой манипуляции
-                ph_i = (3. * np.pi) / 4. if self.reference_i[bit_index - add_idx] == 0 else (7. * np.pi) / 4.
-                ph_q = (3. * np.pi) / 4. if self.reference_q[bit_index - add_idx] == 0 else (7. * np.pi) / 4.
-            else:
-                ph_i = (3. * np.pi) / 4. if self.research_i[bit_index] == 0 else (7. * np.pi) / 4.
-                ph_q = (3. * np.pi) / 4. if self.research_q[bit_index] == 0 else (7. * np.pi) / 4.
-
-        # Заполнение списка отсчетов\значений
-        value = complex(np.cos(params["freq"] * t + ph_i), np.cos(params["freq"] * t + ph_q))
-        return value
+            i_states, q_states = reference_i[bit_indices], reference_q[bit_indices]
+        elif not insert_reference:
+            research_indices = np.clip(bit_indices, 0, len(self.research_i) - 1)
+            i_states = scheme.symbols(self.research_i)[research_indices]
+            q_states = scheme.symbols(self.research_q)[research_indices]
+        else:
+            # Вставка эталонного сигнала: выбор по номерам в объединённых массивах состояний
+            source = self._get_source_indices(params, times, bit_indices, add_idx,
+                                              len(reference_i), len(self.research_i), samples_count is None)
+            i_states = np.concatenate((reference_i, scheme.symbols(self.research_i)))[source]
+            q_states = np.concatenate((reference_q, scheme.symbols(self.research_q)))[source]
+
+        # Сборка сигнала по шаблонам символов
+        templates = self._get_templates(mod_type, times, params, samples_count is None)
+        values = scheme.modulate(templates, i_states, q_states, params)
+
+        # Добавление эффекта доплера
+        if params["signal_type"] == SignalType.RESEARCH:
+            values = values * np.exp(2j * np.pi * self.doppler_effect * times)
+
+        return [times, values]
+
+    def _calc_research_modulation(self, mod_type: ModulationType, reference: np.ndarray = None):
+        """
+        Построить исследуемый сигнал с задержанным эталонным согласно delay_model.
+
+        При дробной задержке эталонный сигнал reference (без шума; по умолчанию
+        строится заново) интерполируется в моменты (t - td) * (1 + fd / f0):
+        задержка не округляется до бита или отсчёта, а доплеровское смещение
+        задаётся сжатием времени, а не только сдвигом частоты.
+        """
+        params = self._get_signal_parameters(len(self.research_i))
+        if self.delay_model == DelayModel.BIT:
+            return self._calc_modulation(mod_type, params)
+
+        if reference is None:
+            reference = self._calc_modulation(mod_type, self._get_signal_parameters(len(self.reference_i)))[1]
+        times, values = self._calc_modulation(mod_type, params, insert_reference=False)
+        return [times, self._insert_fractional(times, values, np.asarray(reference), params)]
+
+    def _insert_fractional(self, times: np.ndarray, values: np.ndarray, reference: np.ndarray, params: dict):
+        """
+        Заменить отсчёты исследуемого сигнала values в моменты times эталонным
+        сигналом reference с дробной задержкой и масштабированием времени.
+        """
+        # Позиции отсчётов исследуемого сигнала на сетке эталонного
+        scale = 1. + self.doppler_effect / self.signal_freq
+        positions = (times - self.time_delay / 1000) * scale / params["timestep"]
+        inserted = (positions >= 0) & (positions <= reference.size - 1)
+        values[inserted] = resample_at(reference, positions[inserted])
+        if self.baseband:
+            # Огибающая задержанного сигнала сдвигается по фазе несущей: exp(j * w * (t' - t))
+            warped = positions[inserted] * params["timestep"]
+            values[inserted] *= np.exp(1j * params["freq"] * (warped - times[inserted]))
+        return values
+
+    def _get_templates(self, mod_type: ModulationType, times: np.ndarray, params: dict, cache: bool = True):
+        """
+        Получить шаблоны символов схемы модуляции для временной сетки сигнала.
+
+        Шаблоны полного сигнала кэшируются по параметрам сигнала и схемы.
+        """
+        scheme = get_modulation(mod_type)
+        if not cache:
+            return scheme.templates(self, times, params)
+        key = (mod_type, params["signal_duration"], params["timestep"], params["bit_time"], params["baseband"],
+               scheme.parameters(self))
+        if key not in self._templates_cache:
+            # Хранятся шаблоны только для последних параметров (эталонный и исследуемый сигналы)
+            if len(self._templates_cache) >= 2:
+                self._templates_cache.clear()
+            self._templates_cache[key] = scheme.templates(self, times, params)
+        return self._templates_cache[key]
+
+    def _get_sample_bit_indices(self, params: dict, first_sample: int = 0, samples_count: int = None):
+        """
+        Получить временные отсчёты сигнала и номера битов, которым они принадлежат.
+
+        Массивы зависят только от параметров сигнала, поэтому вычисляются один
+        раз и повторно используются при следующих расчётах.
+        """
+        # Фрагменты сигнала в потоковом режиме не повторяются и не кэшируются
+        if samples_count is not None:
+            times = (first_sample + np.arange(samples_count)) * params["timestep"]
+            return times, (times / params["bit_time"]).astype(np.int64)
+
+        key = (params["signal_duration"], params["timestep"], params["bit_time"])
+        if key not in self._bit_indices_cache:
+            # Хранятся массивы только для последних параметров (эталонный и исследуемый сигналы)
+            if len(self._bit_indices_cache) >= 2:
+                self._bit_indices_cache.clear()
+            times = np.arange(0, params["signal_duration"], params["timestep"])
+            self._bit_indices_cache[key] = (times, (times / params["bit_time"]).astype(np.int64))
+        return self._bit_indices_cache[key]
+
+    def _get_source_indices(self, params: dict, times: np.ndarray, bit_indices: np.ndarray, add_idx: int,
+                            reference_count: int, research_count: int, cache: bool = True):
+        """
+        Получить для каждого отсчёта исследуемого сигнала номер бита-источника
+        в объединённом массиве [биты эталонного сигнала, биты исследуемого сигнала].
+
+        Номера зависят только от параметров сигнала и временной задержки,
+        поэтому вычисляются один раз для конфигурации и повторно используются
+        во всех испытаниях.
+        """
+        key = (params["signal_duration"], params["timestep"], params["bit_time"], self.time_delay,
+               add_idx, reference_count, research_count)
+        if cache and key in self._source_indices_cache:
+            return self._source_indices_cache[key]
+
+        reference_indices = bit_indices - add_idx
+        inserted = (times >= self.time_delay / 1000) & (reference_indices < reference_count)
+        source = np.where(inserted, np.clip(reference_indices, 0, reference_count - 1),
+                          reference_count + np.clip(bit_indices, 0, research_count - 1))
+        if cache:
+            self._source_indices_cache.clear()
+            self._source_indices_cache[key] = source
+        return source
 
     def calculate(self, mod_type: ModulationType):
         """
         Произвести расчёт и получить графики.
         """
-        # Генерация информационных битов
-        self._generate_info_bits()
-        # Получение I и Q компонент
-        self.reference_i, self.reference_q = self._get_components(self.reference_bits)
-        self.research_i, self.research_q = self._get_components(self.research_bits)
-        # Модуляция
-        self.reference_mod = self._calc_modulation(mod_type, self._get_signal_parameters(len(self.reference_i)))
-        self.research_mod = self._calc_modulation(mod_type, self._get_signal_parameters(len(self.research_i)))
-        # Добавление шума
-        self.reference_mod = self._get_noise_parts(self.reference_mod)
-        self.research_mod = self._get_noise_parts(self.research_mod)
-        # Корреляция
-        self.correlation = self._get_correlation()
-        # Оценка временной задержки
-        self.found_time_delay = self._find_correlation_max()
-        # Вычисление критерия выраженности главного максимума
-        self.criterion = self._calc_criterion()
-        # Вычисление взаимной функции неопределенности
-        self.fn3d = self._calc_3d_function()
-        self._calc_2d_function()
+        self.mod_type = mod_type
+        with self._call():
+            # Генерация информационных битов
+            with self._stage("bits"):
+                self._generate_info_bits()
+            # Получение I и Q компонент
+            with self._stage("components"):
+                self.reference_i, self.reference_q = self._get_reference_components(mod_type)
+                self.research_i, self.research_q = self._get_components(self.research_bits)
+            # Модуляция
+            with self._stage("modulation") as counters:
+                self.reference_mod = self._calc_modulation(mod_type,
+                                                           self._get_signal_parameters(len(self.reference_i)))
+                self.research_mod = self._calc_research_modulation(mod_type, self.reference_mod[1])
+                counters["samples"] = len(self.reference_mod[0]) + len(self.research_mod[0])
+            # Добавление шума
+            with self._stage("noise") as counters:
+                self.reference_mod = self._get_noise_parts(self.reference_mod)
+                self.research_mod = self._get_noise_parts(self.research_mod)
+                counters["samples"] = len(self.reference_mod[0]) + len(self.research_mod[0])
+            # Оценка задержки и функции неопределенности
+            self._process_signals()
 
-    def _get_noise_parts(self, signal: list):
+    def _call(self):
         """
-        Наложить шум на комплексную огибающую.
+        Контекст профилирования одного вызова расчёта.
         """
-        r_part = self._get_complex_part(signal, ComplexPart.REAL)
-        r_part = self._generate_noise(r_part)
-        i_part = self._get_complex_part(signal, ComplexPart.IMAGE)
-        i_part = self._generate_noise(i_part)
-        return self._concat_complex_part(r_part, i_part)
+        return self.profiler.call() if self.profiler is not None else contextlib.nullcontext()
 
-    def _generate_noise(self, signal: list):
+    def _stage(self, name: str):
         """
-        Генерация шума для сигнала
+        Контекст профилирования стадии расчёта.
         """
-        if not signal:
-            return
+        return self.profiler.stage(name) if self.profiler is not None else contextlib.nullcontext({})
 
-        # Расчет энергии шума
-        signal_energy = self._calc_signal_energy(signal)
-        noise_energy = signal_energy / (10 ** (self.snr / 10))
+    def load_recorded(self, reference, research, sampling_rate: float = None):
+        """
+        Использовать записанные отсчёты в качестве эталонного и исследуемого сигналов.
 
-        # Случайная шумовая добавка к каждому отсчету
-        noise = []
-        random_energy = 0.
-        for i in range(len(signal[1])):
-            random_value = self._get_random_value()
-            noise.append(random_value)
-            random_energy += random_value ** 2
+        Массивы (в том числе отображённые в память) используются без копирования.
+        Тип модуляции сбрасывается: параметры схем модуляции (ширина главного
+        лепестка, полоса) к записанным сигналам не применяются.
+        """
+        self.mod_type = None
+        if sampling_rate is not None:
+            self.sampling_rate = float(sampling_rate)
+        timestep = 1. / self.sampling_rate
+        self.reference_mod = [SampleTimes(len(reference), timestep), reference]
+        self.research_mod = [SampleTimes(len(research), timestep), research]
 
-        # Зашумленный сигнал
-        alpha = np.sqrt(noise_energy / random_energy)
-        noise_signal = []
-        for i in range(len(signal[1])):
-            noise_signal.append(signal[1][i] + alpha * noise[i])
+    def calculate_recorded(self):
+        """
+        Произвести расчёт для загруженных записанных сигналов.
+        """
+        with self._call():
+            self._process_signals()
 
-        return [signal[0], noise_signal]
+    def _process_signals(self):
+        """
+        Оценка временной задержки и функции неопределенности по готовым сигналам.
+        """
+        # Прореживание
+        if self.get_decimation_factor() > 1:
+            with self._stage("decimation") as counters:
+                self._get_processing_signals()
+                counters["samples"] = len(self.reference_mod[0]) + len(self.research_mod[0])
+        research_samples = len(self._get_processing_signals()[1][0])
+        # Корреляция
+        with self._stage("correlation") as counters:
+            self.correlation = self._get_correlation()
+            counters["samples"] = research_samples
+        # Оценка временной задержки и критерия выраженности главного максимума
+        with self._stage("statistics") as counters:
+            self.correlation_stats = self._calc_correlation_stats()
+            self.found_time_delay = self._find_correlation_max()
+            self.criterion = self._calc_criterion()
+            counters["samples"] = len(self.correlation[1])
+        # Вычисление взаимной функции неопределенности
+        with self._stage("fn3d") as counters:
+            self.fn3d = self._calc_3d_function()
+            counters["samples"] = research_samples
+        with self._stage("fn2d") as counters:
+            self._calc_2d_function()
+            counters["samples"] = len(self.fn2d_tao[0]) * len(self.fn2d_doppler[0])
+        # Обнаружение всех значимых пиков
+        if self.cfar_type is not None:
+            with self._stage("detection") as counters:
+                self._detect_peaks()
+                counters["samples"] = len(self.correlation[1]) + len(self.fn2d_tao[0]) * len(self.fn2d_doppler[0])
+
+    def generate_reference(self, mod_type: ModulationType):
+        """
+        Сформировать новый зашумленный эталонный сигнал.
+        """
+        self.mod_type = mod_type
+        self.reference_bits = self._generate_bits(self.bits_count)
+        self.reference_i, self.reference_q = self._get_reference_components(mod_type)
+        self.reference_mod = self._calc_modulation(mod_type, self._get_signal_parameters(len(self.reference_i)))
+        self.reference_mod = self._get_noise_parts(self.reference_mod)
+        return self.reference_mod
+
+    def calculate_stream(self, mod_type: ModulationType, block_size: int, blocks_count: int = None):
+        """
+        Поблочный расчёт оценки временной задержки для исследуемого сигнала
+        произвольной длительности.
+
+        Исследуемый сигнал формируется блоками по block_size отсчётов и сразу
+        коррелируется с эталонным, поэтому в памяти хранится только текущий блок.
+        Эталонный сигнал вставляется согласно delay_model (при дробной задержке -
+        интерполяцией в отсчёты каждого блока). После каждого блока возвращается словарь с корреляцией для новых задержек
+        и текущей оценкой временной задержки.
+        """
+        # Формирование эталонного сигнала
+        self.generate_reference(mod_type)
+        correlator = OverlapSaveCorrelator(np.array(self.reference_mod[1]), block_size)
+
+        params = self._get_signal_parameters(len(self.reference_i))
+        fractional = self.delay_model == DelayModel.FRACTIONAL
+        if fractional:
+            # Эталонный сигнал без шума для дробной задержки
+            clean_reference = np.asarray(self._calc_modulation(mod_type, params)[1])
+        params["signal_type"] = SignalType.RESEARCH
+        # Номер бита, с которого начинаются буферы исследуемого сигнала
+        first_bit = 0
+        self.research_i = np.empty(0, dtype=np.uint8)
+        self.research_q = np.empty(0, dtype=np.uint8)
+        block_idx = 0
+        while blocks_count is None or block_idx < blocks_count:
+            first_sample = block_idx * block_size
+            # Диапазон битов, необходимых для блока
+            from_bit = int(first_sample * params["timestep"] / params["bit_time"])
+            to_bit = int((first_sample + block_size - 1) * params["timestep"] / params["bit_time"]) + 1
+            # Отбрасывание использованных битов (с сохранением чётности для пар I/Q)
+            drop = (from_bit - first_bit) // 2 * 2
+            self.research_i, self.research_q = self.research_i[drop:], self.research_q[drop:]
+            first_bit += drop
+            # Генерация недостающих битов
+            missing = to_bit - first_bit - len(self.research_i)
+            if missing > 0:
+                new_i, new_q = self._get_components(self._generate_bits(missing + missing % 2))
+                self.research_i = np.concatenate((self.research_i, new_i))
+                self.research_q = np.concatenate((self.research_q, new_q))
+
+            # Модуляция и наложение шума
+            block = self._calc_modulation(mod_type, params, first_sample, block_size, first_bit,
+                                          insert_reference=not fractional)
+            if fractional:
+                block[1] = self._insert_fractional(block[0], block[1], clean_reference, params)
+            block = self._get_noise_parts(block)
+            # Корреляция
+            correlation = correlator.process(np.array(block[1]))
+            tao = (correlator.lag - correlation.size + np.arange(correlation.size)) * params["timestep"]
+            self.found_time_delay = correlator.peak_lag * params["timestep"] * 1000
+            block_idx += 1
+            yield {"tao": tao,
+                   "correlation": correlation,
+                   "peak_value": correlator.peak_value,
+                   "time_delay": self.found_time_delay}
 
-    @staticmethod
-    def _calc_signal_energy(signal: list):
+    def _get_noise_parts(self, signal: list):
         """
-        Расчет энергии сигнала
+        Наложить шум выбранной модели на комплексную огибающую.
         """
-        energy = 0.
-        for i in range(len(signal[1])):
-            energy += signal[1][i] ** 2
-        return energy
+        return [signal[0], add_noise(signal[1], self.snr, self.noise_type, signal[0], **self._get_noise_params())]
 
-    @staticmethod
-    def _get_random_value():
+    def _get_noise_params(self):
         """
-        Рандомизация чисел для шума
+        Параметры выбранной модели шума.
         """
-        av = 20
-        value = 0.
-        for i in range(av):
-            value += random.uniform(-1, 1)
-        return value / av
+        if self.noise_type == NoiseType.COLORED:
+            return {"exponent": self.noise_exponent}
+        if self.noise_type == NoiseType.IMPULSIVE:
+            return {"probability": self.impulse_probability, "ratio": self.impulse_ratio}
+        if self.noise_type == NoiseType.INTERFERENCE:
+            return {"freq": self.interference_freq, "ratio": self.interference_ratio}
+        return {}
 
-    @staticmethod
-    def _get_complex_part(signal: list, part: ComplexPart):
+    def get_display_signal(self, signal: list):
         """
-        Получение синфазного/квадратурного сигнала.
+        Сигнал для отображения: в режиме комплексной огибающей (при
+        upconvert_display) - перенесённый на несущую z(t) * exp(j * w * t).
         """
-        x = signal[0]
-        y = []
-        if part == ComplexPart.REAL:
-            y = [v.real for v in signal[1]]
-        elif part == ComplexPart.IMAGE:
-            y = [v.imag for v in signal[1]]
-        return [x, y]
+        if not (self.baseband and self.upconvert_display):
+            return signal
+        times = np.asarray(signal[0])
+        return [times, np.asarray(signal[1]) * np.exp(2j * np.pi * self.signal_freq * times)]
 
-    @staticmethod
-    def _concat_complex_part(real_part: list, image_part: list):
+    def get_decimation_factor(self):
         """
-        Получить комплексную огибающую по компонентам.
+        Коэффициент прореживания сигналов перед корреляцией.
+
+        При автоматическом выборе частота дискретизации понижается до
+        необходимой для несущей, полосы схемы модуляции и доплеровского смещения.
         """
-        x = real_part[0]
-        y = []
-        for i in range(len(real_part[1])):
-            y.append(complex(real_part[1][i], image_part[1][i]))
-        return [x, y]
+        if self.decimation is not None:
+            return int(self.decimation)
+        if self.mod_type is None:
+            return 1
+        carrier = 0. if self.baseband else self.signal_freq
+        max_freq = carrier + get_modulation(self.mod_type).bandwidth(self) + abs(self.doppler_effect)
+        return decimation_factor(self.sampling_rate, max_freq)
+
+    def _get_processing_signals(self):
+        """
+        Эталонный и исследуемый сигналы для корреляции и функции неопределенности
+        (прореженные, если задано прореживание).
+
+        Результат прореживания сохраняется до замены исходных сигналов.
+        """
+        factor = self.get_decimation_factor()
+        if factor == 1:
+            return self.reference_mod, self.research_mod
+        cached = self._decimated
+        if cached is None or cached[0] is not self.reference_mod or cached[1] is not self.research_mod \
+                or cached[2] != factor:
+            signals = tuple([np.asarray(signal[0][::factor]), decimate(signal[1], factor)]
+                            for signal in (self.reference_mod, self.research_mod))
+            self._decimated = cached = (self.reference_mod, self.research_mod, factor, signals)
+        return cached[3]
 
     def _get_correlation(self, is_abs: bool = True):
         """
         Расчет взаимной корреляционной функции опорного и исследуемого сигналов.
         """
-        research = np.array(self.research_mod[1])
-        modulate = np.array(self.reference_mod[1])
-        y = np.correlate(research, modulate, 'valid').tolist()
+        reference_mod, research_mod = self._get_processing_signals()
+        research = np.asarray(research_mod[1])
+        modulate = np.asarray(reference_mod[1])
+        if self.correlation_mode == CorrelationMode.DOPPLER_BANK:
+            y = self._get_doppler_bank_correlation(research, modulate)
+        else:
+            y = matched_filter(research, modulate)
         if is_abs:
             y = np.abs(y)
         y = y / np.max(y)
-        x = self.research_mod[0][:len(y)]
+        x = research_mod[0][:len(y)]
         return [x, y]
 
+    def _get_doppler_bank_correlation(self, research: np.ndarray, modulate: np.ndarray):
+        """
+        Расчет взаимной корреляционной функции с компенсацией доплеровского смещения.
+
+        Используется корреляция с копией эталонного сигнала, сдвинутой на
+        гипотезу доплеровского смещения с наибольшим максимумом.
+        """
+        reference_mod = self._get_processing_signals()[0]
+        step_time = reference_mod[0][1] - reference_mod[0][0]
+        dopplers = np.asarray(self.doppler_bank, dtype=float)
+        peaks, best_idx, y = doppler_bank_correlation(research, modulate, step_time, dopplers,
+                                                       DEFAULT_DOPPLER_BANK_TILE)
+        self.doppler_bank_peaks = peaks
+        self.found_doppler_bank = dopplers[best_idx]
+        return y
+
+    def _calc_correlation_stats(self):
+        """
+        Вычисление статистик главного максимума корреляционной функции за один проход.
+        """
+        return peak_statistics(self.correlation[1], self._get_mainlobe_samples())
+
+    def _get_mainlobe_samples(self):
+        """
+        Полуширина главного лепестка корреляционной функции в отсчётах задержки
+        (после прореживания) по схеме модуляции последнего расчёта.
+        """
+        if self.mod_type is not None:
+            duration = get_modulation(self.mod_type).mainlobe(self)
+        else:
+            # Записанные сигналы - как для схем с I и Q компонентами данных
+            duration = 2. / self.bits_per_second
+        step_time = self.correlation[0][1] - self.correlation[0][0]
+        return max(int(round(duration / step_time)), 1)
+
     def _find_correlation_max(self):
         """
         Нахождение максимума корреляционной функции.
         """
-        max_element_idx = np.argmax(self.correlation[1])
-        return self.correlation[0][max_element_idx] * 1000
+        return self.correlation[0][int(self.correlation_stats["peak_idx"])] * 1000
 
     def _calc_criterion(self):
         """
         Нахождение критерия выраженности главного максимума.
         """
-        # Нахождение значения главного максимума
-        max_value_idx = np.argmax(self.correlation[1])
-        # Вычисление среднеквадратичного отклонения
-        return self.correlation[1][max_value_idx] / np.std(self.correlation[1])
+        return float(self.correlation_stats["criterion"])
+
+    def _detect_peaks(self):
+        """
+        Обнаружение пиков корреляционной функции и функции неопределенности методом CFAR.
+
+        Защитная зона по задержке (если не задана) равна полуширине главного
+        лепестка, а пики в пределах главного лепестка более сильного пика
+        объединяются с ним. Пики сохраняются в виде словарей с задержкой (мс),
+        доплеровской частотой (Гц) и отношением сигнал/шум (дБ) в порядке
+        убывания отношения сигнал/шум.
+        """
+        mainlobe = self._get_mainlobe_samples()
+        guard = (self.cfar_guard[0], mainlobe if self.cfar_guard[1] is None else self.cfar_guard[1])
+        (lags,), snr = cfar_detect(self.correlation[1], self.cfar_type, guard[1], self.cfar_train[1],
+                                   self.cfar_threshold, mainlobe)
+        self.correlation_peaks = [{"time_delay": self.correlation[0][lag] * 1000,
+                                   "doppler": None,
+                                   "snr": value} for lag, value in zip(lags, snr)]
+
+        (rows, cols), snr = cfar_detect(self.fn3d.values, self.cfar_type, guard, self.cfar_train,
+                                        self.cfar_threshold, (guard[0], mainlobe))
+        self.fn3d_peaks = [{"time_delay": self.fn3d.tao_list[col] * 1000,
+                            "doppler": self.fn3d.doppler_list[row],
+                            "snr": value} for row, col, value in zip(rows, cols, snr)]
 
     def _calc_3d_function(self):
         """
         Вычисление взаимной функции неопределенности.
         """
         # Вычисление корреляции
-        research = np.array(self.research_mod[1])
-        modulate = np.conj(np.array(self.reference_mod[1]))
-        # Вычисление диапазона времени
-        from_time = 0
-        to_time = self.research_mod[0][-len(self.reference_mod[0])]
-        step_time = self.reference_mod[0][1] - self.reference_mod[0][0]
-        # Значения частоты
-        y = np.fft.fftfreq(modulate.size, d=step_time)
-        # Значения времени, значения функции неопределенности
-        x, z = [], []
-        for t in np.arange(from_time, to_time, step_time):
-            # Вычисление индекса
-            idx = int(t / step_time)
-            # Вычисление корреляции
-            mul = np.multiply(modulate, research[idx:idx+modulate.shape[0]])
+        reference_mod, research_mod = self._get_processing_signals()
+        research = np.asarray(research_mod[1])
+        modulate = np.conj(np.asarray(reference_mod[1]))
+        # Шаг и количество отсчётов задержки
+        step_time = reference_mod[0][1] - reference_mod[0][0]
+        tao_count = research.size - modulate.size
+        # Значения задержки и частоты (частоты упорядочены по возрастанию)
+        x = np.arange(tao_count) * step_time
+        y = np.fft.fftshift(np.fft.fftfreq(modulate.size, d=step_time))
+        fn3d = AmbiguityFunction(x, y, self.fn3d_path)
+        # Окна исследуемого сигнала для каждого отсчёта задержки (без копирования)
+        windows = np.lib.stride_tricks.sliding_window_view(research, modulate.size)
+
+        def calc_tile(tile):
+            start, stop = tile
+            # Вычисление корреляции для блока задержек
+            mul = np.multiply(windows[start:stop], modulate)
             # Вычисление Фурье
-            fourier = np.fft.fft(mul).tolist()
-            x.append(t)
-            z.append(np.abs(fourier))
+            return np.fft.fftshift(np.abs(np.fft.fft(mul, axis=1)), axes=1)
+
+        tiles = list(iter_tiles(tao_count, self.tile_size))
+        if self.fft_workers > 1:
+            # БПФ блоков выполняются параллельно (NumPy освобождает GIL), а запись
+            # в матрицу - по порядку блоков, группами по fft_workers блоков
+            with ThreadPoolExecutor(self.fft_workers) as executor:
+                for group_start in range(0, len(tiles), self.fft_workers):
+                    group = tiles[group_start:group_start + self.fft_workers]
+                    for (start, _), fourier in zip(group, executor.map(calc_tile, group)):
+                        fn3d.set_tile(start, fourier.T)
+        else:
+            for tile in tiles:
+                fn3d.set_tile(tile[0], calc_tile(tile).T)
+        fn3d.flush()
 
         # Сохранение значений на осях
         self.tao_list = x
-        self.doppler_list = y.tolist()
-        # Преобразование значений на осях к 2d array
-        x, y = np.meshgrid(np.array(x), y)
-        return [x, y, np.stack(z, axis=1)]
+        self.doppler_list = y
+        return fn3d
 
     def _calc_2d_function(self):
         """
         Вычисление взаимной функции неопределенности.
         """
-        self.fn2d_tao = [self.tao_list, np.amax(self.fn3d[2], axis=0).tolist()]
-        doppler_y_values = np.amax(self.fn3d[2], axis=1).tolist()
-        doppler_x, doppler_y = zip(*sorted(zip(self.doppler_list, doppler_y_values)))
-        self.fn2d_doppler = [doppler_x, doppler_y]
-        self.found_doppler = doppler_x[np.argmax(doppler_y)]
-        self.found_time_delay_f = self.tao_list[np.argmax(self.fn2d_tao[1])] * 1000
+        self.fn2d_tao = [self.fn3d.tao_list, self.fn3d.fn2d_tao]
+        self.fn2d_doppler = [self.fn3d.doppler_list, self.fn3d.fn2d_doppler]
+        self.found_doppler = self.fn3d.peak_doppler
+        self.found_time_delay_f = self.fn3d.peak_tao * 1000
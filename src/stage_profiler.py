@@ -0,0 +1,106 @@
+import contextlib
+import time
+import tracemalloc
+
+
+class StageProfiler:
+    """
+    Замер времени выполнения и объёма выделенной памяти для стадий расчёта.
+
+    Результаты сохраняются для каждого вызова расчёта и накапливаются по
+    всем вызовам, например за время исследования.
+    """
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        # Результаты отдельных вызовов расчёта
+        self.calls = []
+        # Накопленные результаты по стадиям
+        self.totals = {}
+        self._current = None
+
+    @contextlib.contextmanager
+    def call(self):
+        """
+        Контекст одного вызова расчёта.
+        """
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        self._current = {}
+        try:
+            yield self._current
+        finally:
+            self.calls.append(self._current)
+            self._current = None
+            if started:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """
+        Контекст одной стадии расчёта.
+
+        Возвращает словарь счётчиков, в который стадия может записать
+        количество обработанных отсчётов ("samples").
+        """
+        counters = {"samples": 0}
+        memory_before = 0
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        start_time = time.perf_counter()
+        try:
+            yield counters
+        finally:
+            seconds = time.perf_counter() - start_time
+            allocated = 0
+            if self.trace_memory and tracemalloc.is_tracing():
+                allocated = tracemalloc.get_traced_memory()[1] - memory_before
+            self._add(name, seconds, counters["samples"], allocated)
+
+    def _add(self, name: str, seconds: float, samples: int, allocated: int):
+        """
+        Учесть результаты стадии в текущем вызове и в накопленных значениях.
+        """
+        record = {"seconds": seconds, "samples": samples, "allocated": allocated}
+        if self._current is not None:
+            self._current[name] = record
+        total = self.totals.setdefault(name, {"count": 0, "seconds": 0., "samples": 0, "allocated": 0})
+        total["count"] += 1
+        total["seconds"] += seconds
+        total["samples"] += samples
+        total["allocated"] = max(total["allocated"], allocated)
+
+    def summary(self):
+        """
+        Сводка по стадиям: суммарное и среднее время, доля от общего времени,
+        скорость обработки отсчётов и максимальный объём выделенной памяти.
+        """
+        full_time = sum(total["seconds"] for total in self.totals.values())
+        result = []
+        for name, total in self.totals.items():
+            result.append({"stage": name,
+                           "count": total["count"],
+                           "seconds": total["seconds"],
+                           "mean_seconds": total["seconds"] / total["count"],
+                           "share": total["seconds"] / full_time if full_time else 0.,
+                           "samples_per_second": total["samples"] / total["seconds"] if total["seconds"] else 0.,
+                           "allocated": total["allocated"]})
+        return result
+
+    def report(self):
+        """
+        Текстовый отчёт по стадиям.
+        """
+        lines = [f"{'Стадия':<14}{'Вызовов':>9}{'Среднее, мс':>14}{'Доля, %':>10}{'Память, МБ':>12}"]
+        for item in self.summary():
+            lines.append(f"{item['stage']:<14}{item['count']:>9}{item['mean_seconds'] * 1000:>14.2f}"
+                         f"{item['share'] * 100:>10.1f}{item['allocated'] / 2 ** 20:>12.2f}")
+        return "\n".join(lines)
+
+    def reset(self):
+        """
+        Сбросить накопленные результаты.
+        """
+        self.calls = []
+        self.totals = {}
@@ -0,0 +1,106 @@
+import numpy as np
+
+
+def matched_filter(research: np.ndarray, reference: np.ndarray, spectra: dict = None):
+    """
+    Взаимная корреляционная функция через БПФ (согласованный фильтр).
+
+    Совпадает с np.correlate(research, reference, 'valid'), но требует
+    O(N log N) операций вместо O(N * M).
+
+    :param spectra: Кэш сопряжённых спектров эталонного сигнала по размеру БПФ
+                    (для повторных вызовов с тем же эталонным сигналом).
+    """
+    count = research.size - reference.size + 1
+    nfft = 1 << int(np.ceil(np.log2(research.size)))
+    if spectra is None:
+        reference_fft = np.conj(np.fft.fft(reference, nfft))
+    else:
+        if nfft not in spectra:
+            spectra[nfft] = np.conj(np.fft.fft(reference, nfft))
+        reference_fft = spectra[nfft]
+    fourier = np.fft.fft(research, nfft) * reference_fft
+    return np.fft.ifft(fourier)[:count]
+
+
+def doppler_bank_correlation(research: np.ndarray, reference: np.ndarray, timestep: float,
+                             dopplers: np.ndarray, tile: int):
+    """
+    Взаимная корреляция с банком копий эталонного сигнала, сдвинутых по частоте
+    на каждую из гипотез доплеровского смещения.
+
+    Спектр исследуемого сигнала вычисляется один раз, а корреляции для блока
+    из tile гипотез - одним пакетным обратным БПФ.
+
+    :return: Максимумы модуля корреляции для каждой гипотезы, номер лучшей
+             гипотезы и комплексная корреляционная функция для неё.
+    """
+    count = research.size - reference.size + 1
+    nfft = 1 << int(np.ceil(np.log2(research.size)))
+    research_fft = np.fft.fft(research, nfft)
+    # Фазовые множители копий эталонного сигнала
+    phasors = np.exp(2j * np.pi * np.outer(dopplers, np.arange(reference.size) * timestep))
+
+    peaks = np.empty(dopplers.size)
+    best_idx, best_correlation = 0, None
+    for start in range(0, dopplers.size, tile):
+        references = reference * phasors[start:start + tile]
+        fourier = research_fft * np.conj(np.fft.fft(references, nfft, axis=1))
+        correlation = np.fft.ifft(fourier, axis=1)[:, :count]
+        peaks[start:start + tile] = np.abs(correlation).max(axis=1)
+        tile_best = np.argmax(peaks[start:start + tile])
+        if best_correlation is None or peaks[start + tile_best] > peaks[best_idx]:
+            best_idx, best_correlation = start + tile_best, correlation[tile_best]
+    return peaks, best_idx, best_correlation
+
+
+class OverlapSaveCorrelator:
+    """
+    Поблочное вычисление взаимной корреляционной функции с эталонным сигналом
+    методом перекрытия с накоплением (overlap-save).
+
+    Хранит только последние len(reference) - 1 отсчётов предыдущего блока,
+    поэтому объём памяти не зависит от длительности исследуемого сигнала.
+    """
+    def __init__(self, reference: np.ndarray, block_size: int):
+        self.reference_size = len(reference)
+        # Размер БПФ - ближайшая степень двойки, вмещающая блок с перекрытием
+        self.nfft = 1 << int(np.ceil(np.log2(block_size + self.reference_size - 1)))
+        # Количество новых отсчётов корреляции за одно БПФ
+        self.step = self.nfft - self.reference_size + 1
+        # Спектр эталонного сигнала вычисляется один раз
+        self.reference_fft = np.conj(np.fft.fft(reference, self.nfft))
+
+        # Хвост предыдущего блока
+        self.tail = np.empty(0, dtype=complex)
+        # Отсчёт задержки, соответствующий следующему значению корреляции
+        self.lag = 0
+        # Текущий максимум модуля корреляции
+        self.peak_value = 0.
+        self.peak_lag = 0
+
+    def process(self, block: np.ndarray):
+        """
+        Обработать очередной блок исследуемого сигнала.
+
+        :return: Модуль корреляции для задержек, ставших доступными после блока.
+        """
+        data = np.concatenate((self.tail, block))
+        count = max(data.size - self.reference_size + 1, 0)
+        result = np.empty(count)
+        for start in range(0, count, self.step):
+            stop = min(start + self.step, count)
+            segment = data[start:stop + self.reference_size - 1]
+            fourier = np.fft.fft(segment, self.nfft) * self.reference_fft
+            result[start:stop] = np.abs(np.fft.ifft(fourier)[:stop - start])
+
+        # Обновление текущего максимума
+        if count:
+            max_idx = np.argmax(result)
+            if result[max_idx] > self.peak_value:
+                self.peak_value = result[max_idx]
+                self.peak_lag = self.lag + max_idx
+
+        self.tail = data[count:]
+        self.lag += count
+        return result
@@ -0,0 +1,369 @@
+import argparse
+import heapq
+import json
+import os
+import random
+import zlib
+import numpy as np
+from enum import Enum
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from defaults import DEFAULT_AVERAGE_COUNT, DEFAULT_BITS_COUNT, DEFAULT_SAMPLING_RATE
+from signals_generator import SignalGenerator
+from enums import ModulationType, DelayModel, NoiseType, CorrelationMode, CfarType
+
+# Усредняемые результаты испытания
+SWEEP_METRICS = ("criterion", "pslr", "isl", "found_time_delay")
+
+# Ось плана, задающая тип модуляции
+MOD_TYPE_AXIS = "mod_type"
+
+# Типы параметров SignalGenerator, которые можно задавать в исследовании
+PARAMETER_TYPES = {"sampling_rate": float,
+                   "signal_freq": float,
+                   "bits_count": int,
+                   "bits_per_second": float,
+                   "time_delay": float,
+                   "snr": float,
+                   "doppler_effect": float,
+                   "signal_phase": float,
+                   "delay_model": DelayModel,
+                   "tile_size": int,
+                   "decimation": int,
+                   "fft_workers": int,
+                   "noise_type": NoiseType,
+                   "noise_exponent": float,
+                   "impulse_probability": float,
+                   "impulse_ratio": float,
+                   "interference_freq": float,
+                   "interference_ratio": float,
+                   "baseband": bool,
+                   "correlation_mode": CorrelationMode,
+                   "cfar_type": CfarType,
+                   "cfar_threshold": float,
+                   "low_ampl": float,
+                   "high_ampl": float,
+                   "mod_index": float,
+                   "chirp_bandwidth": float,
+                   "chirp_bt": float}
+# Параметры, допускающие значение None.
+# Путь к файлу функции неопределенности (fn3d_path) не задаётся: все точки и
+# процессы исследования записывали бы одну и ту же матрицу.
+OPTIONAL_PARAMETERS = ("decimation", "cfar_type")
+
+
+def _axis_value(name: str, value):
+    """
+    Привести значение оси к виду, используемому в параметрах испытания
+    (целочисленные параметры округляются, чтобы план содержал только
+    действительно рассчитываемые значения).
+    """
+    if name == MOD_TYPE_AXIS:
+        return value.name if isinstance(value, ModulationType) else ModulationType[value].name
+    value = value.item() if isinstance(value, np.generic) else value
+    if name in OPTIONAL_PARAMETERS and value == "None":
+        return None
+    if PARAMETER_TYPES.get(name) is int and isinstance(value, (int, float)):
+        return int(round(value))
+    return value
+
+
+def _coerce(name: str, value):
+    """
+    Привести значение параметра генератора к его типу (перечисления задаются
+    именем элемента, логические значения - также строками "True"/"False").
+    """
+    if name not in PARAMETER_TYPES:
+        raise ValueError(f"Неизвестный параметр генератора: {name}")
+    kind = PARAMETER_TYPES[name]
+    value = _axis_value(name, value)
+    if value is None:
+        if name not in OPTIONAL_PARAMETERS:
+            raise ValueError(f"Параметр генератора {name} не может быть None")
+        return None
+    if issubclass(kind, Enum):
+        return value if isinstance(value, kind) else kind[value]
+    if kind is bool and isinstance(value, str):
+        if value not in ("True", "False"):
+            raise ValueError(f"Некорректное логическое значение параметра {name}: {value}")
+        return value == "True"
+    return kind(value)
+
+
+class SweepPlan:
+    """
+    План исследования: набор точек в пространстве параметров SignalGenerator
+    и типа модуляции.
+
+    Для декартовой сетки результаты собираются в массив размером shape
+    (по одной оси на параметр), для латинского гиперкуба - в вектор точек.
+    """
+    def __init__(self, axes: dict, points: list, shape: tuple):
+        self.axes = axes
+        self.points = points
+        self.shape = shape
+
+    @classmethod
+    def cartesian(cls, axes: dict):
+        """
+        Декартова сетка по значениям каждой оси.
+        """
+        axes = {name: [_axis_value(name, value) for value in values] for name, values in axes.items()}
+        shape = tuple(len(values) for values in axes.values())
+        points = []
+        for index in np.ndindex(*shape):
+            params = {name: values[idx] for (name, values), idx in zip(axes.items(), index)}
+            points.append((index, params))
+        return cls(axes, points, shape)
+
+    @classmethod
+    def latin_hypercube(cls, ranges: dict, count: int, seed: int = 0):
+        """
+        Латинский гиперкуб из count точек.
+
+        :param ranges: Для числовых параметров - границы (low, high),
+                       для типа модуляции - список значений.
+        """
+        rng = np.random.default_rng(seed)
+        columns = {}
+        for name, bounds in ranges.items():
+            strata = rng.permutation(count)
+            if name == MOD_TYPE_AXIS:
+                values = [_axis_value(name, value) for value in bounds]
+                columns[name] = [values[idx] for idx in strata * len(values) // count]
+            else:
+                low, high = bounds
+                values = low + (strata + rng.random(count)) / count * (high - low)
+                columns[name] = [_axis_value(name, value) for value in values.tolist()]
+        points = [((idx,), {name: column[idx] for name, column in columns.items()}) for idx in range(count)]
+        return cls(columns, points, (count,))
+
+    def units(self, average_count: int, base: dict = None):
+        """
+        Разбиение плана на элементарные задания.
+
+        Точки с одинаковыми параметрами объединяются в одно задание.
+
+        :return: Словарь: ключ задания -> {"params", "indices"}.
+        """
+        units = {}
+        for index, params in self.points:
+            params = {**(base or {}), **params}
+            key = json.dumps({"params": params, "average_count": average_count}, sort_keys=True)
+            units.setdefault(key, {"params": params, "indices": []})["indices"].append(index)
+        return units
+
+
+def apply_parameters(generator: SignalGenerator, params: dict):
+    """
+    Установить параметры генератора с приведением к типу по PARAMETER_TYPES
+    (перечисления задаются именем элемента, например noise_type="AWGN").
+
+    :return: Тип модуляции испытания.
+    """
+    mod_type = ModulationType.FM
+    for name, value in params.items():
+        if name == MOD_TYPE_AXIS:
+            mod_type = ModulationType[value]
+        else:
+            setattr(generator, name, _coerce(name, value))
+    return mod_type
+
+
+def run_trials(seed_key: str, params: dict, count: int, progress=None, collect=None):
+    """
+    Выполнить count испытаний в одной точке плана.
+
+    Генераторы случайных чисел инициализируются по seed_key, поэтому
+    результат не зависит от порядка выполнения заданий.
+
+    :param progress: Функция, вызываемая после каждого испытания.
+    :param collect: Функция, получающая генератор после каждого испытания
+                    (для сохранения корреляций и функции неопределенности).
+    :return: Суммы результатов по испытаниям.
+    """
+    seed = zlib.crc32(seed_key.encode())
+    random.seed(seed)
+    np.random.seed(seed)
+
+    generator = SignalGenerator()
+    mod_type = apply_parameters(generator, params)
+    sums = dict.fromkeys(SWEEP_METRICS, 0.)
+    for _ in range(count):
+        generator.calculate(mod_type)
+        values = {**generator.correlation_stats, "found_time_delay": generator.found_time_delay}
+        for name in SWEEP_METRICS:
+            sums[name] += float(values[name])
+        if collect is not None:
+            collect(generator)
+        if progress is not None:
+            progress()
+    return sums
+
+
+def run_unit(key: str, params: dict, average_count: int):
+    """
+    Выполнить задание: average_count испытаний в одной точке плана.
+    """
+    sums = run_trials(key, params, average_count)
+    return {name: value / average_count for name, value in sums.items()}
+
+
+def default_priority(params: dict, average_count: int):
+    """
+    Приоритет задания (меньше - раньше): сначала самые длительные задания.
+    """
+    bits_count = params.get("bits_count", float(DEFAULT_BITS_COUNT))
+    sampling_rate = params.get("sampling_rate", float(DEFAULT_SAMPLING_RATE))
+    return -bits_count * sampling_rate * average_count
+
+
+def load_cache(path: str):
+    """
+    Загрузить результаты ранее выполненных заданий.
+    """
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_cache(path: str, cache: dict):
+    """
+    Сохранить результаты выполненных заданий (с атомарной заменой файла).
+    """
+    if path is None:
+        return
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(cache, file)
+    os.replace(path + ".tmp", path)
+
+
+def run_sweep(plan: SweepPlan, average_count: int, base: dict = None, processes: int = None,
+              cache_path: str = None, priority=default_priority):
+    """
+    Выполнить исследование по плану на пуле процессов.
+
+    Задания, результаты которых есть в кэше, не пересчитываются. Остальные
+    передаются пулу в порядке приоритета; одновременно в очереди пула
+    находится не больше 2 * processes заданий.
+
+    :return: Словарь: название результата -> массив размером plan.shape.
+    """
+    units = plan.units(average_count, base)
+    cache = load_cache(cache_path)
+    pending = [(priority(unit["params"], average_count), key) for key, unit in units.items() if key not in cache]
+    heapq.heapify(pending)
+    print(f"Заданий: {len(units)}, из кэша: {len(units) - len(pending)}")
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        while pending:
+            _, key = heapq.heappop(pending)
+            cache[key] = run_unit(key, units[key]["params"], average_count)
+            save_cache(cache_path, cache)
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            running = {}
+            while pending or running:
+                while pending and len(running) < 2 * processes:
+                    _, key = heapq.heappop(pending)
+                    running[executor.submit(run_unit, key, units[key]["params"], average_count)] = key
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cache[running.pop(future)] = future.result()
+                save_cache(cache_path, cache)
+
+    return collect_results(plan, units, cache)
+
+
+def collect_results(plan: SweepPlan, units: dict, cache: dict):
+    """
+    Собрать результаты заданий в массивы размером plan.shape.
+    """
+    results = {name: np.full(plan.shape, np.nan) for name in SWEEP_METRICS}
+    for key, unit in units.items():
+        for index in unit["indices"]:
+            for name in SWEEP_METRICS:
+                results[name][index] = cache[key][name]
+    return results
+
+
+def _parse_values(name: str, text: str):
+    """
+    Значения оси из строки "v1,v2,..." или "start:stop:step".
+
+    Нечисловые значения (имена элементов перечислений) остаются строками.
+    """
+    if name == MOD_TYPE_AXIS:
+        return text.split(",")
+    if ":" in text:
+        return np.arange(*map(float, text.split(":"))).tolist()
+    values = []
+    for value in text.split(","):
+        try:
+            values.append(float(value))
+        except ValueError:
+            values.append(value)
+    return values
+
+
+def add_plan_arguments(parser: argparse.ArgumentParser):
+    """
+    Добавить в parser параметры плана исследования.
+    """
+    parser.add_argument("--axis", action="append", default=[], metavar="NAME=VALUES",
+                        help="ось декартовой сетки: v1,v2,... или start:stop:step (для латинского "
+                             "гиперкуба - границы low:high)")
+    parser.add_argument("--lhs", type=int, default=None, metavar="COUNT",
+                        help="латинский гиперкуб из COUNT точек вместо декартовой сетки")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--average", type=int, default=int(DEFAULT_AVERAGE_COUNT))
+    parser.add_argument("--cache", default=None, help="файл кэша результатов (JSON)")
+    parser.add_argument("--output", default="sweep.npz")
+
+
+def build_plan(args):
+    """
+    Построить план исследования по параметрам командной строки.
+    """
+    axes = {}
+    for item in args.axis:
+        name, text = item.split("=", 1)
+        if args.lhs is not None and name != MOD_TYPE_AXIS:
+            axes[name] = tuple(map(float, text.split(":")))
+        else:
+            axes[name] = _parse_values(name, text)
+
+    if args.lhs is not None:
+        return SweepPlan.latin_hypercube(axes, args.lhs, args.seed)
+    return SweepPlan.cartesian(axes)
+
+
+def save_results(path: str, plan: SweepPlan, results: dict):
+    """
+    Сохранить оси плана и результаты исследования в файл .npz.
+    """
+    axes = {}
+    for name, values in plan.axes.items():
+        axes[f"axis_{name}"] = np.asarray(values)
+        # Оси со значением None (например, автоматическое прореживание) сохраняются строками
+        if axes[f"axis_{name}"].dtype == object:
+            axes[f"axis_{name}"] = np.asarray([str(value) for value in values])
+    np.savez(path, **axes, **results)
+    print(f"Результаты сохранены в {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Исследование по сетке параметров SignalGenerator")
+    add_plan_arguments(parser)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    plan = build_plan(args)
+    results = run_sweep(plan, args.average, processes=args.processes, cache_path=args.cache)
+    save_results(args.output, plan, results)
+
+
+if __name__ == "__main__":
+    main()